@@ -1,41 +1,122 @@
+import mmap
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from os.path import basename
+from tkinter import ttk, filedialog, messagebox, font as tkfont
+
+@dataclass(slots=True)
+class _State:
+    """Non-widget state of the modder, kept out of the Tk instance __dict__."""
+    rom_path: str | None = None
+    rom_data: mmap.mmap | None = None
+    rom_loaded: bool = False
+    built: bool = False  # Tk.__init__ has run via _build()
+    pending_text: dict = field(default_factory=dict)
+
 
 class MariOS64Modder(tk.Tk):
     """
     A GUI application for modding Super Mario 64, inspired by the cancelled MariOS 64.
     This is a prototype and does not perform actual ROM hacking.
     """
+    _STYLE_CONFIG = (
+        ('.', {'background': "#2E2E2E", 'foreground': "white", 'fieldbackground': "#4A4A4A", 'bordercolor': "#555555"}),
+        ('TNotebook', {'background': '#2E2E2E', 'borderwidth': 0}),
+        ('TNotebook.Tab', {'background': '#4A4A4A', 'foreground': 'white', 'padding': [10, 5], 'borderwidth': 0}),
+        ('TFrame', {'background': '#3C3C3C'}),
+        ('TButton', {'background': '#5A5A5A', 'foreground': 'white', 'padding': 6, 'relief': 'flat'}),
+        ('TLabel', {'background': '#3C3C3C', 'foreground': 'white', 'font': 'ModderUI'}),
+        ('Header.TLabel', {'font': 'ModderHeader'}),
+        ('Small.TLabel', {'font': 'ModderSmall'}),
+        ('TEntry', {'fieldbackground': "#4A4A4A", 'foreground': "white", 'insertbackground': "white"}),
+        ('TSpinbox', {'fieldbackground': "#4A4A4A", 'foreground': "white", 'insertbackground': "white"}),
+    )
+    _STYLE_MAP = (
+        ('TNotebook.Tab', {'background': [('selected', '#3C3C3C')]}),
+        ('TButton', {'background': [('active', '#6A6A6A')]}),
+    )
+    _STYLES_CONFIGURED_VAR = '::modderStylesConfigured'
+    _ROM_FILETYPES = (("N64 ROMs", "*.z64 *.n64"), ("All files", "*.*"))
+    _PLAYER_MODS_TEMPLATE = (
+        "Applying Player Mods:\n\n"
+        " - Cap Color set to: {cap}\n"
+        " - Lives set to: {lives}\n"
+        " - Max Health Wedges: {health}\n\n"
+        "(This is a simulation. No changes were made to the ROM.)"
+    )
+
     def __init__(self):
+        # Only plain Python state is set up here; the Tcl interpreter and all
+        # widgets are created by _build(), so constructing the class is cheap
+        # and opens no window.
+        self._s = _State()
+        self._info = messagebox.showinfo
+        self._warn = messagebox.showwarning
+        self._err = messagebox.showerror
+        # ROM reads run on a worker thread so slow disks don't freeze the UI;
+        # Tk itself is only ever touched from the main thread.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+    @classmethod
+    def run(cls):
+        """Create, build and run the modder window."""
+        app = cls()
+        app._build()
+        app.mainloop()
+
+    def _build(self):
         super().__init__()
+        self._s.built = True
+        # Keep the window unmapped while it is built so it is laid out once.
+        self.withdraw()
         self.title("Flames Co. MariOS Darkness build 10325")
         self.geometry("800x600")
         self.configure(bg="#2E2E2E")
-        self.rom_path = None
 
         # --- Style Configuration ---
         self.style = ttk.Style(self)
-        self.style.theme_use('clam')
-        self.style.configure('.', background="#2E2E2E", foreground="white", fieldbackground="#4A4A4A", bordercolor="#555555")
-        self.style.configure('TNotebook', background='#2E2E2E', borderwidth=0)
-        self.style.configure('TNotebook.Tab', background='#4A4A4A', foreground='white', padding=[10, 5], borderwidth=0)
-        self.style.map('TNotebook.Tab', background=[('selected', '#3C3C3C')])
-        self.style.configure('TFrame', background='#3C3C3C')
-        self.style.configure('TButton', background='#5A5A5A', foreground='white', padding=6, relief='flat')
-        self.style.map('TButton', background=[('active', '#6A6A6A')])
-        self.style.configure('TLabel', background='#3C3C3C', foreground='white', font=('Segoe UI', 10))
-        self.style.configure('Header.TLabel', font=('Segoe UI', 14, 'bold'))
-        self.style.configure('TEntry', fieldbackground="#4A4A4A", foreground="white", insertbackground="white")
-        self.style.configure('TSpinbox', fieldbackground="#4A4A4A", foreground="white", insertbackground="white")
+        self._configure_styles()
 
         self._create_widgets()
+        self.update_idletasks()
+        self.deiconify()
+        self.after_idle(self._prime_dialogs)
+
+    def _configure_styles(self):
+        # ttk styles and named fonts belong to the Tcl interpreter, so they
+        # only need setting up once per interpreter. The marker lives in Tcl
+        # itself, which keeps it correct if a fresh Tk is ever created.
+        if self.tk.call('info', 'exists', self._STYLES_CONFIGURED_VAR):
+            return
+        self.style.theme_use('clam')
+        # Named fonts are created once and referenced by name from the styles,
+        # so Tk doesn't parse a font tuple for every label.
+        self._ui_font = tkfont.Font(self, name='ModderUI', family='Segoe UI', size=10)
+        self._small_font = tkfont.Font(self, name='ModderSmall', family='Segoe UI', size=9)
+        self._header_font = tkfont.Font(self, name='ModderHeader', family='Segoe UI', size=14, weight='bold')
+        configure = self.style.configure
+        for name, options in self._STYLE_CONFIG:
+            configure(name, **options)
+        style_map = self.style.map
+        for name, options in self._STYLE_MAP:
+            style_map(name, **options)
+        self.tk.call('set', self._STYLES_CONFIGURED_VAR, 1)
+
+    def _prime_dialogs(self):
+        # On X11 the file and message dialogs are Tcl procs that get
+        # autoloaded on first use, which stalls the first click. Calling them
+        # with a bad option loads the code without showing anything, moving
+        # that one-off cost to startup idle time.
+        self.tk.eval('catch {tk_getOpenFile -badoption}')
+        self.tk.eval('catch {tk_messageBox -badoption}')
 
     def _create_widgets(self):
         # --- Top Frame for File Operations ---
         top_frame = ttk.Frame(self, padding="10")
         top_frame.pack(fill='x', side='top')
 
-        self.rom_label = ttk.Label(top_frame, text="No ROM Loaded", font=('Segoe UI', 9), style='TLabel')
+        self.rom_label = ttk.Label(top_frame, text="No ROM Loaded", style='Small.TLabel')
         self.rom_label.pack(side='left', padx=(0, 10))
 
         self.open_button = ttk.Button(top_frame, text="Open SM64 ROM", command=self.open_rom)
@@ -48,106 +129,208 @@ class MariOS64Modder(tk.Tk):
         notebook = ttk.Notebook(self, padding="10")
         notebook.pack(expand=True, fill='both')
 
-        player_frame = self._create_player_tab()
-        level_frame = self._create_level_tab()
-        texture_frame = self._create_texture_tab()
-
-        notebook.add(player_frame, text='Player Mods')
-        notebook.add(level_frame, text='Level Editor')
-        notebook.add(texture_frame, text='Texture Importer')
+        # Tabs start as empty placeholders and are filled in the first time
+        # they are selected, so startup only pays for the visible tab.
+        self._tab_builders = {
+            0: ("Mario Character Properties", self._create_player_tab),
+            1: ("Level & Star Editor", self._create_level_tab),
+            2: ("Custom Texture Importer", self._create_texture_tab),
+        }
+        self._tab_built = set()
+        self._tab_frames = {}
+        for index, text in enumerate(('Player Mods', 'Level Editor', 'Texture Importer')):
+            self._tab_frames[index] = self._new_tab(notebook, text)
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # --- Status Bar ---
         self.status_bar = ttk.Label(self, text="Welcome to MariOS 64 Modder", anchor='w', padding=5)
         self.status_bar.pack(side='bottom', fill='x')
 
-    def _create_player_tab(self):
-        frame = ttk.Frame(padding="20")
-        ttk.Label(frame, text="Mario Character Properties", style='Header.TLabel').pack(pady=(0, 20), anchor='w')
+    def _set_text(self, widget, text):
+        # Coalesce label updates into a single config call per widget on the
+        # next idle pass instead of one synchronous Tcl call per change.
+        if not self._s.pending_text:
+            self.after_idle(self._flush_text)
+        self._s.pending_text[widget] = text
+
+    def _flush_text(self):
+        pending, self._s.pending_text = self._s.pending_text, {}
+        for widget, text in pending.items():
+            widget.config(text=text)
+
+    def _set_status(self, text):
+        self._set_text(self.status_bar, text)
+
+    def _debounced_trace(self, var, fn, delay=50):
+        # Holding a Spinbox arrow writes its variable on every repeat tick;
+        # an unthrottled trace would run fn for each one. Only call fn once
+        # the value has settled for `delay` ms.
+        job = None
+
+        def fire():
+            nonlocal job
+            job = None
+            try:
+                value = var.get()
+            except tk.TclError:  # Partially typed, non-numeric entry
+                return
+            fn(value)
+
+        def on_write(*_):
+            nonlocal job
+            if job is not None:
+                self.after_cancel(job)
+            job = self.after(delay, fire)
+
+        var.trace_add("write", on_write)
+
+    def _new_tab(self, notebook, text):
+        frame = ttk.Frame(notebook, padding="20")
+        notebook.add(frame, text=text)
+        return frame
+
+    def _on_tab_changed(self, event):
+        index = event.widget.index("current")
+        if index in self._tab_built:
+            return
+        header, builder = self._tab_builders[index]
+        frame = self._tab_frames[index]
+        # Tabs use a single-column grid: row 0 is the header and each
+        # builder lays its widgets out in the rows below.
+        frame.columnconfigure(0, weight=1)
+        ttk.Label(frame, text=header, style='Header.TLabel').grid(row=0, column=0, sticky='w', pady=(0, 20))
+        builder(frame)
+        self._tab_built.add(index)
+
+    def _create_player_tab(self, frame):
+        # Named Tcl variables are reused if the tab is ever rebuilt,
+        # rather than allocating fresh PY_VARn slots each time.
+        if not hasattr(self, 'cap_color'):
+            self.cap_color = tk.StringVar(self, value='Red', name='capColor')
+            self.infinite_lives = tk.BooleanVar(self, name='infLives')
+            self.max_health = tk.IntVar(self, value=8, name='maxHealth')
+            self._debounced_trace(self.max_health, self._preview_health)
 
         # --- Cap Color ---
-        ttk.Label(frame, text="Mario's Cap Color:").pack(anchor='w', pady=(0, 5))
-        self.cap_color = tk.StringVar(value='Red')
+        ttk.Label(frame, text="Mario's Cap Color:").grid(row=1, column=0, sticky='w', pady=(0, 5))
         cap_options = ['Red', 'Green (Luigi)', 'Blue (Wario)', 'Yellow']
-        cap_menu = ttk.OptionMenu(frame, self.cap_color, self.cap_color.get(), *cap_options)
-        cap_menu.pack(fill='x', pady=(0, 15))
+        cap_menu = ttk.OptionMenu(frame, self.cap_color, self.cap_color.get())
+        add_option = cap_menu["menu"].add_radiobutton
+        cap_color = self.cap_color
+        for option in cap_options:
+            add_option(label=option, value=option, variable=cap_color)
+        cap_menu.grid(row=2, column=0, sticky='ew', pady=(0, 15))
 
         # --- Infinite Lives ---
-        self.infinite_lives = tk.BooleanVar()
-        ttk.Checkbutton(frame, text="Infinite Lives", variable=self.infinite_lives).pack(anchor='w', pady=(0, 15))
+        ttk.Checkbutton(frame, text="Infinite Lives", variable=self.infinite_lives).grid(row=3, column=0, sticky='w', pady=(0, 15))
 
         # --- Health Modifier ---
-        ttk.Label(frame, text="Max Health (Wedges):").pack(anchor='w', pady=(0, 5))
-        self.max_health = tk.IntVar(value=8)
-        ttk.Spinbox(frame, from_=1, to=16, textvariable=self.max_health, width=10).pack(anchor='w', pady=(0, 25))
+        ttk.Label(frame, text="Max Health (Wedges):").grid(row=4, column=0, sticky='w', pady=(0, 5))
+        ttk.Spinbox(frame, from_=1, to=16, textvariable=self.max_health, width=10).grid(row=5, column=0, sticky='w', pady=(0, 25))
 
         apply_button = ttk.Button(frame, text="Apply Player Mods", command=self.apply_player_mods)
-        apply_button.pack(anchor='w')
-        
-        return frame
+        apply_button.grid(row=6, column=0, sticky='w')
 
-    def _create_level_tab(self):
-        frame = ttk.Frame(padding="20")
-        ttk.Label(frame, text="Level & Star Editor", style='Header.TLabel').pack(pady=(0, 20), anchor='w')
-        
-        ttk.Label(frame, text="This is a conceptual placeholder for level editing features.").pack(anchor='w')
-        
-        return frame
+    def _create_level_tab(self, frame):
+        ttk.Label(frame, text="This is a conceptual placeholder for level editing features.").grid(row=1, column=0, sticky='w')
 
-    def _create_texture_tab(self):
-        frame = ttk.Frame(padding="20")
-        ttk.Label(frame, text="Custom Texture Importer", style='Header.TLabel').pack(pady=(0, 20), anchor='w')
-        
-        ttk.Label(frame, text="This feature would allow replacing in-game textures.").pack(anchor='w', pady=(0,10))
-        
+    def _create_texture_tab(self, frame):
+        ttk.Label(frame, text="This feature would allow replacing in-game textures.").grid(row=1, column=0, sticky='w', pady=(0, 10))
         import_button = ttk.Button(frame, text="Import Texture...", command=self.import_texture)
-        import_button.pack(anchor='w')
-        
-        return frame
+        import_button.grid(row=2, column=0, sticky='w')
 
     def open_rom(self):
         path = filedialog.askopenfilename(
             title="Select Super Mario 64 ROM",
-            filetypes=(("N64 ROMs", "*.z64 *.n64"), ("All files", "*.*"))
+            filetypes=self._ROM_FILETYPES
         )
         if path:
-            self.rom_path = path
-            filename = path.split('/')[-1]
-            self.rom_label.config(text=f"Loaded: {filename}")
-            self.status_bar.config(text=f"Successfully loaded {filename}")
-            self.save_button.config(state='normal')
-            messagebox.showinfo("ROM Loaded", f"'{filename}' has been loaded into the program.")
+            self.open_button.config(state='disabled')
+            self._set_status(f"Loading {basename(path)}...")
+            future = self._io_pool.submit(self._read_rom, path)
+            self._poll_rom_load(path, future)
+
+    @staticmethod
+    def _read_rom(path):
+        # Map the ROM read-only rather than read() it, so patching code can
+        # slice it zero-copy and only touched pages are ever loaded.
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def rom_view(self):
+        """Zero-copy view of the loaded ROM, or None if no ROM is loaded."""
+        if self._s.rom_data is None:
+            return None
+        return memoryview(self._s.rom_data)
+
+    def _close_rom(self):
+        if self._s.rom_data is not None:
+            self._s.rom_data.close()
+            self._s.rom_data = None
+
+    def _poll_rom_load(self, path, future):
+        if not future.done():
+            self.after(10, self._poll_rom_load, path, future)
+            return
+
+        self.open_button.config(state='normal')
+        try:
+            data = future.result()
+        except (OSError, ValueError) as e:
+            self._set_status("Failed to load ROM.")
+            self._err("Error", f"Failed to read ROM: {e}")
+            return
+
+        self._close_rom()
+        self._s.rom_path = path
+        self._s.rom_data = data
+        self._s.rom_loaded = True
+        filename = basename(path)
+        self._set_text(self.rom_label, f"Loaded: {filename}")
+        self._set_status(f"Successfully loaded {filename}")
+        self.save_button.config(state='normal')
+        self._info("ROM Loaded", f"'{filename}' has been loaded into the program.")
+
+    def _require_rom(self, title):
+        if not self._s.rom_loaded:
+            self._warn(title, "Please load a ROM first.")
+            return False
+        return True
 
     def save_rom(self):
-        if not self.rom_path:
-            messagebox.showerror("Error", "No ROM file is currently loaded.")
+        if not self._require_rom("Save ROM"):
             return
         
-        messagebox.showinfo("Save ROM", "This is a placeholder. In a real application, the modified ROM would be saved here.")
-        self.status_bar.config(text="Modded ROM saved (simulation).")
+        self._info("Save ROM", "This is a placeholder. In a real application, the modified ROM would be saved here.")
+        self._set_status("Modded ROM saved (simulation).")
+
+    def _preview_health(self, health):
+        self._set_status(f"Max Health preview: {health} wedges")
 
     def apply_player_mods(self):
-        if not self.rom_path:
-            messagebox.showwarning("Warning", "Please load a ROM before applying mods.")
+        if not self._require_rom("Apply Player Mods"):
             return
 
         cap = self.cap_color.get()
         lives = "Infinite" if self.infinite_lives.get() else "Default"
         health = self.max_health.get()
 
-        info_message = (
-            f"Applying Player Mods:\n\n"
-            f" - Cap Color set to: {cap}\n"
-            f" - Lives set to: {lives}\n"
-            f" - Max Health Wedges: {health}\n\n"
-            f"(This is a simulation. No changes were made to the ROM.)"
-        )
-        messagebox.showinfo("Applying Mods", info_message)
-        self.status_bar.config(text="Player mods applied (simulation).")
+        info_message = self._PLAYER_MODS_TEMPLATE.format(cap=cap, lives=lives, health=health)
+        self._info("Applying Mods", info_message)
+        self._set_status("Player mods applied (simulation).")
         
     def import_texture(self):
-        messagebox.showinfo("Import Texture", "This is a placeholder for the texture import functionality.")
+        self._info("Import Texture", "This is a placeholder for the texture import functionality.")
+
+    def destroy(self):
+        self._io_pool.shutdown(wait=False)
+        self._close_rom()
+        # An instance that was never built has no Tcl interpreter to tear
+        # down, and any Tk attribute lookup on it would recurse.
+        if self._s.built:
+            super().destroy()
 
 
 if __name__ == "__main__":
-    app = MariOS64Modder()
-    app.mainloop()
+    MariOS64Modder.run()
@@ -20,817 +20,192 @@ ENHANCEMENTS v1.01:
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 import json
 import struct
 import threading
 import time
-from collections import defaultdict, deque
-import hashlib
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 
+from darkness_core import ROMHeader, MIPSCPU, Memory, RDRAM_SIZE
 
-class ROMHeader:
-    """N64 ROM Header Parser with Validation"""
-    def __init__(self, data):
-        self.raw_data = data[:0x1000]  # Read first 4KB for header
-        self.valid = False
-        self.parse()
-        
-    def parse(self):
-        """Parse ROM header information"""
-        if len(self.raw_data) < 0x40:
-            return
-            
-        # Check endianness and convert if needed
-        magic = struct.unpack('>I', self.raw_data[0:4])[0]
-        
-        if magic == 0x80371240:  # Big endian (z64)
-            self.endian = 'big'
-            self.valid = True
-        elif magic == 0x40123780:  # Little endian (n64)
-            self.endian = 'little'
-            self.raw_data = self.swap_endian_n64(self.raw_data)
-            self.valid = True
-        elif magic == 0x37804012:  # Byte-swapped (v64)
-            self.endian = 'byteswap'
-            self.raw_data = self.swap_endian_v64(self.raw_data)
-            self.valid = True
-        else:
-            self.endian = 'unknown'
-            return
-            
-        # Parse header fields
-        self.clock_rate = struct.unpack('>I', self.raw_data[0x04:0x08])[0]
-        self.boot_address = struct.unpack('>I', self.raw_data[0x08:0x0C])[0]
-        self.release = struct.unpack('>I', self.raw_data[0x0C:0x10])[0]
-        
-        # CRC
-        self.crc1 = struct.unpack('>I', self.raw_data[0x10:0x14])[0]
-        self.crc2 = struct.unpack('>I', self.raw_data[0x14:0x18])[0]
-        
-        # Unknown fields
-        self.unknown1 = struct.unpack('>Q', self.raw_data[0x18:0x20])[0]
-        
-        # Name (20 bytes)
-        self.name = self.raw_data[0x20:0x34].decode('ascii', errors='ignore').strip('\x00')
-        
-        # Unknown
-        self.unknown2 = struct.unpack('>I', self.raw_data[0x34:0x38])[0]
-        
-        # Manufacturer ID
-        self.manufacturer = struct.unpack('>I', self.raw_data[0x38:0x3C])[0]
-        
-        # Cartridge ID
-        self.cart_id_word = struct.unpack('>H', self.raw_data[0x3C:0x3E])[0]
-        
-        # Country code
-        self.country_code = chr(self.raw_data[0x3E])
-        self.country = self.get_country_name(self.country_code)
-        
-        # Version
-        self.version = self.raw_data[0x3F]
-        
-        # Game ID (from 0x3B-0x3E)
-        self.game_id = self.raw_data[0x3B:0x3F].decode('ascii', errors='ignore')
-        
-        # Calculate ROM hash
-        self.rom_hash = hashlib.md5(self.raw_data[:0x100]).hexdigest()
-        
-    def get_country_name(self, code):
-        """Get country name from code"""
-        countries = {
-            'A': 'All/Demo', 'D': 'Germany', 'E': 'USA', 'F': 'France',
-            'I': 'Italy', 'J': 'Japan', 'S': 'Spain', 'U': 'Australia',
-            'P': 'Europe', 'N': 'Canada', 'X': 'Europe (X)',
-            'Y': 'Europe (Y)', 'Z': 'Europe (Z)'
-        }
-        return countries.get(code, 'Unknown')
-        
-    def swap_endian_n64(self, data):
-        """Convert little endian to big endian"""
-        result = bytearray(len(data))
-        for i in range(0, len(data), 4):
-            result[i:i+4] = data[i:i+4][::-1]
-        return bytes(result)
-        
-    def swap_endian_v64(self, data):
-        """Convert byte-swapped to big endian"""
-        result = bytearray(len(data))
-        for i in range(0, len(data), 2):
-            result[i] = data[i+1]
-            result[i+1] = data[i]
-        return bytes(result)
+STATE_MAGIC = b"MIPSEMU-STATE\x00\x01\x00"  # Leads binary save state files
+STATE_CHUNK = 1 << 20  # RDRAM bytes compressed per write when saving
 
+# Help texts, built once rather than on every menu open
+MAPPING_TEXT = """
+════════════════════════════════════════
+        N64 CONTROLLER MAPPING
+════════════════════════════════════════
 
-class COP0:
-    """Coprocessor 0 - System Control"""
-    def __init__(self):
-        self.registers = [0] * 32
-        # Important COP0 registers
-        self.INDEX = 0
-        self.RANDOM = 1
-        self.ENTRYLO0 = 2
-        self.ENTRYLO1 = 3
-        self.CONTEXT = 4
-        self.PAGEMASK = 5
-        self.WIRED = 6
-        self.BADVADDR = 8
-        self.COUNT = 9
-        self.ENTRYHI = 10
-        self.COMPARE = 11
-        self.STATUS = 12
-        self.CAUSE = 13
-        self.EPC = 14
-        self.PRID = 15  # Processor ID
-        self.CONFIG = 16
-        self.LLADDR = 17
-        self.WATCHLO = 18
-        self.WATCHHI = 19
-        self.XCONTEXT = 20
-        self.PERR = 26
-        self.CACHEERR = 27
-        self.TAGLO = 28
-        self.TAGHI = 29
-        self.ERROREPC = 30
-        
-        # Initialize processor ID
-        self.registers[self.PRID] = 0x00000B00  # VR4300
-        self.registers[self.STATUS] = 0x34000000  # Boot status
-        
-    def read(self, reg):
-        return self.registers[reg & 0x1F]
-        
-    def write(self, reg, value):
-        reg = reg & 0x1F
-        if reg == 0:  # Index register can be written
-            self.registers[reg] = value & 0x3F
-        elif reg == self.RANDOM:
-            pass  # Random is read-only, auto-increments
-        elif reg == self.COMPARE:
-            self.registers[reg] = value
-            self.registers[self.CAUSE] &= ~0x8000  # Clear timer interrupt
-        else:
-            self.registers[reg] = value
+D-Pad:
+  Up      → Arrow Up
+  Down    → Arrow Down
+  Left    → Arrow Left
+  Right   → Arrow Right
 
+Buttons:
+  A       → Z key
+  B       → X key
+  START   → Enter
+  Z       → A key
 
-class MIPSCPU:
-    """Enhanced MIPS R4300i CPU Core with Extended Instruction Set"""
-    def __init__(self, memory):
-        self.memory = memory
-        self.pc = 0xA4000040  # Boot address
-        self.next_pc = self.pc + 4
-        self.registers = [0] * 32  # 32 general purpose registers
-        self.registers[0] = 0  # $zero always 0
-        self.hi = 0
-        self.lo = 0
-        self.cop0 = COP0()
-        self.cop1_registers = [0] * 32  # FPU registers (stubs)
-        
-        self.running = False
-        self.instructions_executed = 0
-        self.cycles = 0
-        
-        # Branch delay slot
-        self.branch_delay = False
-        self.delay_slot_pc = 0
-        
-        # Load delay slot (MIPS I architecture)
-        self.load_delay = False
-        self.load_reg = 0
-        self.load_value = 0
-        
-        # LLbit for LL/SC instructions
-        self.llbit = False
-        self.lladdr = 0
-        
-        # Exception handling
-        self.exception_pending = False
-        self.exception_code = 0
-        
-    def reset(self):
-        """Reset CPU state"""
-        self.pc = 0xA4000040
-        self.next_pc = self.pc + 4
-        self.registers = [0] * 32
-        self.hi = 0
-        self.lo = 0
-        self.instructions_executed = 0
-        self.cycles = 0
-        self.branch_delay = False
-        self.load_delay = False
-        self.llbit = False
-        self.exception_pending = False
-        self.cop0 = COP0()
-        
-    def step(self):
-        """Execute one instruction"""
-        if not self.running:
-            return
-            
-        try:
-            # Handle load delay slot
-            if self.load_delay:
-                self.registers[self.load_reg] = self.load_value
-                self.load_delay = False
-                
-            # Fetch instruction
-            instruction = self.memory.read_word(self.pc)
-            
-            # Decode and execute
-            self.execute_instruction(instruction)
-            
-            # Update PC
-            if self.branch_delay:
-                self.pc = self.delay_slot_pc
-                self.branch_delay = False
-            else:
-                self.pc = self.next_pc
-            self.next_pc = self.pc + 4
-            
-            self.instructions_executed += 1
-            self.cycles += 1
-            
-            # Update COP0 COUNT register (increments every other cycle)
-            if self.cycles % 2 == 0:
-                count = self.cop0.read(self.cop0.COUNT)
-                self.cop0.write(self.cop0.COUNT, (count + 1) & 0xFFFFFFFF)
-                
-            # Check for timer interrupt
-            if self.cop0.read(self.cop0.COUNT) == self.cop0.read(self.cop0.COMPARE):
-                self.cop0.registers[self.cop0.CAUSE] |= 0x8000
-                
-        except Exception as e:
-            print(f"CPU Exception at PC={hex(self.pc)}: {e}")
-            self.running = False
-            
-    def execute_instruction(self, instr):
-        """Decode and execute MIPS instruction"""
-        opcode = (instr >> 26) & 0x3F
-        
-        # Special opcodes
-        if opcode == 0x00:  # SPECIAL
-            self.execute_special(instr)
-        elif opcode == 0x01:  # REGIMM
-            self.execute_regimm(instr)
-        elif opcode == 0x10:  # COP0
-            self.execute_cop0(instr)
-        elif opcode == 0x11:  # COP1 (FPU)
-            self.execute_cop1(instr)
-        # Jump instructions
-        elif opcode == 0x02:  # J - jump
-            target = (instr & 0x3FFFFFF) << 2
-            self.do_branch((self.pc & 0xF0000000) | target)
-        elif opcode == 0x03:  # JAL - jump and link
-            target = (instr & 0x3FFFFFF) << 2
-            self.registers[31] = self.next_pc + 4
-            self.do_branch((self.pc & 0xF0000000) | target)
-        # Branch instructions
-        elif opcode == 0x04:  # BEQ
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF) << 2
-            if self.registers[rs] == self.registers[rt]:
-                self.do_branch(self.next_pc + offset)
-        elif opcode == 0x05:  # BNE
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF) << 2
-            if self.registers[rs] != self.registers[rt]:
-                self.do_branch(self.next_pc + offset)
-        elif opcode == 0x06:  # BLEZ
-            rs = (instr >> 21) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF) << 2
-            if self.signed_word(self.registers[rs]) <= 0:
-                self.do_branch(self.next_pc + offset)
-        elif opcode == 0x07:  # BGTZ
-            rs = (instr >> 21) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF) << 2
-            if self.signed_word(self.registers[rs]) > 0:
-                self.do_branch(self.next_pc + offset)
-        # Immediate arithmetic
-        elif opcode == 0x08:  # ADDI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = (self.registers[rs] + imm) & 0xFFFFFFFF
-        elif opcode == 0x09:  # ADDIU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = (self.registers[rs] + imm) & 0xFFFFFFFF
-        elif opcode == 0x0A:  # SLTI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = 1 if self.signed_word(self.registers[rs]) < imm else 0
-        elif opcode == 0x0B:  # SLTIU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = 1 if self.registers[rs] < (imm & 0xFFFFFFFF) else 0
-        elif opcode == 0x0C:  # ANDI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = instr & 0xFFFF
-            self.registers[rt] = self.registers[rs] & imm
-        elif opcode == 0x0D:  # ORI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = instr & 0xFFFF
-            self.registers[rt] = self.registers[rs] | imm
-        elif opcode == 0x0E:  # XORI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = instr & 0xFFFF
-            self.registers[rt] = self.registers[rs] ^ imm
-        elif opcode == 0x0F:  # LUI
-            rt = (instr >> 16) & 0x1F
-            imm = instr & 0xFFFF
-            self.registers[rt] = (imm << 16) & 0xFFFFFFFF
-        # 64-bit immediate arithmetic
-        elif opcode == 0x18:  # DADDI
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = (self.registers[rs] + imm) & 0xFFFFFFFF
-        elif opcode == 0x19:  # DADDIU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            imm = self.sign_extend_16(instr & 0xFFFF)
-            self.registers[rt] = (self.registers[rs] + imm) & 0xFFFFFFFF
-        # Load instructions
-        elif opcode == 0x20:  # LB
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            value = self.memory.read_byte(addr)
-            if value & 0x80:
-                value |= 0xFFFFFF00
-            self.registers[rt] = value & 0xFFFFFFFF
-        elif opcode == 0x21:  # LH
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            value = self.memory.read_half(addr)
-            if value & 0x8000:
-                value |= 0xFFFF0000
-            self.registers[rt] = value & 0xFFFFFFFF
-        elif opcode == 0x23:  # LW
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.registers[rt] = self.memory.read_word(addr)
-        elif opcode == 0x24:  # LBU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.registers[rt] = self.memory.read_byte(addr)
-        elif opcode == 0x25:  # LHU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.registers[rt] = self.memory.read_half(addr)
-        elif opcode == 0x26:  # LWR - Load Word Right
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            shift = (addr & 3) * 8
-            word = self.memory.read_word(addr & ~3)
-            mask = (1 << shift) - 1
-            self.registers[rt] = (self.registers[rt] & ~mask) | (word & mask)
-        elif opcode == 0x27:  # LWU
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.registers[rt] = self.memory.read_word(addr)
-        # Store instructions
-        elif opcode == 0x28:  # SB
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.memory.write_byte(addr, self.registers[rt] & 0xFF)
-        elif opcode == 0x29:  # SH
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.memory.write_half(addr, self.registers[rt] & 0xFFFF)
-        elif opcode == 0x2B:  # SW
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.memory.write_word(addr, self.registers[rt])
-        # Atomic load/store
-        elif opcode == 0x30:  # LL - Load Linked
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            self.registers[rt] = self.memory.read_word(addr)
-            self.llbit = True
-            self.lladdr = addr
-        elif opcode == 0x38:  # SC - Store Conditional
-            rs, rt = (instr >> 21) & 0x1F, (instr >> 16) & 0x1F
-            offset = self.sign_extend_16(instr & 0xFFFF)
-            addr = (self.registers[rs] + offset) & 0xFFFFFFFF
-            if self.llbit and addr == self.lladdr:
-                self.memory.write_word(addr, self.registers[rt])
-                self.registers[rt] = 1
-            else:
-                self.registers[rt] = 0
-            self.llbit = False
-        # Cache operations
-        elif opcode == 0x2F:  # CACHE
-            pass  # Cache operations are mostly ignored in HLE
-            
-        # Keep $zero always 0
-        self.registers[0] = 0
-        
-    def execute_special(self, instr):
-        """Execute SPECIAL (R-type) instruction"""
-        rs = (instr >> 21) & 0x1F
-        rt = (instr >> 16) & 0x1F
-        rd = (instr >> 11) & 0x1F
-        shamt = (instr >> 6) & 0x1F
-        funct = instr & 0x3F
-        
-        if funct == 0x00:  # SLL
-            self.registers[rd] = (self.registers[rt] << shamt) & 0xFFFFFFFF
-        elif funct == 0x02:  # SRL
-            self.registers[rd] = (self.registers[rt] >> shamt) & 0xFFFFFFFF
-        elif funct == 0x03:  # SRA
-            val = self.signed_word(self.registers[rt])
-            self.registers[rd] = (val >> shamt) & 0xFFFFFFFF
-        elif funct == 0x04:  # SLLV
-            sh = self.registers[rs] & 0x1F
-            self.registers[rd] = (self.registers[rt] << sh) & 0xFFFFFFFF
-        elif funct == 0x06:  # SRLV
-            sh = self.registers[rs] & 0x1F
-            self.registers[rd] = (self.registers[rt] >> sh) & 0xFFFFFFFF
-        elif funct == 0x07:  # SRAV
-            sh = self.registers[rs] & 0x1F
-            val = self.signed_word(self.registers[rt])
-            self.registers[rd] = (val >> sh) & 0xFFFFFFFF
-        elif funct == 0x08:  # JR
-            self.do_branch(self.registers[rs])
-        elif funct == 0x09:  # JALR
-            target = self.registers[rs]
-            self.registers[rd] = self.next_pc + 4
-            self.do_branch(target)
-        elif funct == 0x0C:  # SYSCALL
-            self.trigger_exception(8)  # Syscall exception
-        elif funct == 0x0D:  # BREAK
-            self.trigger_exception(9)  # Breakpoint exception
-        elif funct == 0x0F:  # SYNC
-            pass  # Memory barrier - ignored in HLE
-        elif funct == 0x10:  # MFHI
-            self.registers[rd] = self.hi
-        elif funct == 0x11:  # MTHI
-            self.hi = self.registers[rs]
-        elif funct == 0x12:  # MFLO
-            self.registers[rd] = self.lo
-        elif funct == 0x13:  # MTLO
-            self.lo = self.registers[rs]
-        elif funct == 0x14:  # DSLLV (64-bit)
-            sh = self.registers[rs] & 0x3F
-            self.registers[rd] = (self.registers[rt] << sh) & 0xFFFFFFFF
-        elif funct == 0x16:  # DSRLV (64-bit)
-            sh = self.registers[rs] & 0x3F
-            self.registers[rd] = (self.registers[rt] >> sh) & 0xFFFFFFFF
-        elif funct == 0x17:  # DSRAV (64-bit)
-            sh = self.registers[rs] & 0x3F
-            val = self.signed_word(self.registers[rt])
-            self.registers[rd] = (val >> sh) & 0xFFFFFFFF
-        elif funct == 0x18:  # MULT
-            a = self.signed_word(self.registers[rs])
-            b = self.signed_word(self.registers[rt])
-            result = a * b
-            self.lo = result & 0xFFFFFFFF
-            self.hi = (result >> 32) & 0xFFFFFFFF
-        elif funct == 0x19:  # MULTU
-            result = self.registers[rs] * self.registers[rt]
-            self.lo = result & 0xFFFFFFFF
-            self.hi = (result >> 32) & 0xFFFFFFFF
-        elif funct == 0x1A:  # DIV
-            a = self.signed_word(self.registers[rs])
-            b = self.signed_word(self.registers[rt])
-            if b != 0:
-                self.lo = (a // b) & 0xFFFFFFFF
-                self.hi = (a % b) & 0xFFFFFFFF
-        elif funct == 0x1B:  # DIVU
-            if self.registers[rt] != 0:
-                self.lo = (self.registers[rs] // self.registers[rt]) & 0xFFFFFFFF
-                self.hi = (self.registers[rs] % self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x1C:  # DMULT (64-bit multiply)
-            a = self.signed_word(self.registers[rs])
-            b = self.signed_word(self.registers[rt])
-            result = a * b
-            self.lo = result & 0xFFFFFFFF
-            self.hi = (result >> 32) & 0xFFFFFFFF
-        elif funct == 0x1D:  # DMULTU (64-bit multiply unsigned)
-            result = self.registers[rs] * self.registers[rt]
-            self.lo = result & 0xFFFFFFFF
-            self.hi = (result >> 32) & 0xFFFFFFFF
-        elif funct == 0x1E:  # DDIV (64-bit divide)
-            a = self.signed_word(self.registers[rs])
-            b = self.signed_word(self.registers[rt])
-            if b != 0:
-                self.lo = (a // b) & 0xFFFFFFFF
-                self.hi = (a % b) & 0xFFFFFFFF
-        elif funct == 0x1F:  # DDIVU (64-bit divide unsigned)
-            if self.registers[rt] != 0:
-                self.lo = (self.registers[rs] // self.registers[rt]) & 0xFFFFFFFF
-                self.hi = (self.registers[rs] % self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x20:  # ADD
-            self.registers[rd] = (self.registers[rs] + self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x21:  # ADDU
-            self.registers[rd] = (self.registers[rs] + self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x22:  # SUB
-            self.registers[rd] = (self.registers[rs] - self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x23:  # SUBU
-            self.registers[rd] = (self.registers[rs] - self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x24:  # AND
-            self.registers[rd] = self.registers[rs] & self.registers[rt]
-        elif funct == 0x25:  # OR
-            self.registers[rd] = self.registers[rs] | self.registers[rt]
-        elif funct == 0x26:  # XOR
-            self.registers[rd] = self.registers[rs] ^ self.registers[rt]
-        elif funct == 0x27:  # NOR
-            self.registers[rd] = ~(self.registers[rs] | self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x2A:  # SLT
-            a = self.signed_word(self.registers[rs])
-            b = self.signed_word(self.registers[rt])
-            self.registers[rd] = 1 if a < b else 0
-        elif funct == 0x2B:  # SLTU
-            self.registers[rd] = 1 if self.registers[rs] < self.registers[rt] else 0
-        elif funct == 0x2C:  # DADD (64-bit)
-            self.registers[rd] = (self.registers[rs] + self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x2D:  # DADDU (64-bit)
-            self.registers[rd] = (self.registers[rs] + self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x2E:  # DSUB (64-bit)
-            self.registers[rd] = (self.registers[rs] - self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x2F:  # DSUBU (64-bit)
-            self.registers[rd] = (self.registers[rs] - self.registers[rt]) & 0xFFFFFFFF
-        elif funct == 0x38:  # DSLL (64-bit shift)
-            self.registers[rd] = (self.registers[rt] << shamt) & 0xFFFFFFFF
-        elif funct == 0x3A:  # DSRL (64-bit shift)
-            self.registers[rd] = (self.registers[rt] >> shamt) & 0xFFFFFFFF
-        elif funct == 0x3B:  # DSRA (64-bit shift)
-            val = self.signed_word(self.registers[rt])
-            self.registers[rd] = (val >> shamt) & 0xFFFFFFFF
-        elif funct == 0x3C:  # DSLL32
-            self.registers[rd] = (self.registers[rt] << (shamt + 32)) & 0xFFFFFFFF
-        elif funct == 0x3E:  # DSRL32
-            self.registers[rd] = (self.registers[rt] >> (shamt + 32)) & 0xFFFFFFFF
-        elif funct == 0x3F:  # DSRA32
-            val = self.signed_word(self.registers[rt])
-            self.registers[rd] = (val >> (shamt + 32)) & 0xFFFFFFFF
-            
-        self.registers[0] = 0
-        
-    def execute_regimm(self, instr):
-        """Execute REGIMM branch instructions"""
-        rs = (instr >> 21) & 0x1F
-        rt = (instr >> 16) & 0x1F  # Used as branch type
-        offset = self.sign_extend_16(instr & 0xFFFF) << 2
-        
-        if rt == 0x00:  # BLTZ
-            if self.signed_word(self.registers[rs]) < 0:
-                self.do_branch(self.next_pc + offset)
-        elif rt == 0x01:  # BGEZ
-            if self.signed_word(self.registers[rs]) >= 0:
-                self.do_branch(self.next_pc + offset)
-        elif rt == 0x10:  # BLTZAL
-            if self.signed_word(self.registers[rs]) < 0:
-                self.registers[31] = self.next_pc + 4
-                self.do_branch(self.next_pc + offset)
-        elif rt == 0x11:  # BGEZAL
-            if self.signed_word(self.registers[rs]) >= 0:
-                self.registers[31] = self.next_pc + 4
-                self.do_branch(self.next_pc + offset)
-                
-    def execute_cop0(self, instr):
-        """Execute Coprocessor 0 instruction"""
-        rs = (instr >> 21) & 0x1F
-        rt = (instr >> 16) & 0x1F
-        rd = (instr >> 11) & 0x1F
-        funct = instr & 0x3F
-        
-        if rs == 0x00:  # MFC0 - Move From COP0
-            self.registers[rt] = self.cop0.read(rd)
-        elif rs == 0x04:  # MTC0 - Move To COP0
-            self.cop0.write(rd, self.registers[rt])
-        elif rs == 0x10:  # CO - Coprocessor operation
-            if funct == 0x01:  # TLBR - Read TLB
-                pass
-            elif funct == 0x02:  # TLBWI - Write TLB Indexed
-                pass
-            elif funct == 0x06:  # TLBWR - Write TLB Random
-                pass
-            elif funct == 0x08:  # TLBP - Probe TLB
-                pass
-            elif funct == 0x18:  # ERET - Return from exception
-                self.pc = self.cop0.read(self.cop0.EPC)
-                self.next_pc = self.pc + 4
-                # Clear EXL bit in Status
-                status = self.cop0.read(self.cop0.STATUS)
-                self.cop0.write(self.cop0.STATUS, status & ~0x2)
-                
-    def execute_cop1(self, instr):
-        """Execute Coprocessor 1 (FPU) instruction - STUB"""
-        # FPU is stubbed - just NOP
-        pass
-        
-    def do_branch(self, target):
-        """Set up branch delay slot"""
-        self.delay_slot_pc = target & 0xFFFFFFFF
-        self.branch_delay = True
-        
-    def trigger_exception(self, code):
-        """Trigger CPU exception"""
-        self.exception_pending = True
-        self.exception_code = code
-        # Set EPC to current PC
-        self.cop0.write(self.cop0.EPC, self.pc)
-        # Set exception code in Cause register
-        cause = self.cop0.read(self.cop0.CAUSE)
-        cause = (cause & ~0x7C) | ((code & 0x1F) << 2)
-        self.cop0.write(self.cop0.CAUSE, cause)
-        # Jump to exception handler
-        self.pc = 0x80000180
-        self.next_pc = self.pc + 4
-        
-    def sign_extend_16(self, value):
-        """Sign extend 16-bit value to 32-bit"""
-        if value & 0x8000:
-            return value | 0xFFFF0000
-        return value
-        
-    def signed_word(self, value):
-        """Convert unsigned 32-bit to signed"""
-        if value & 0x80000000:
-            return value - 0x100000000
-        return value
+Triggers:
+  L       → Q key
+  R       → W key
 
+C-Buttons:
+  C-Up    → I key
+  C-Down  → K key
+  C-Left  → J key
+  C-Right → L key
 
-class Memory:
-    """Enhanced N64 Memory System with Cartridge I/O"""
-    def __init__(self):
-        self.rdram = bytearray(8 * 1024 * 1024)  # 8MB RDRAM
-        self.rom = None
-        self.rom_size = 0
-        
-        # Memory-mapped I/O registers
-        self.mi_registers = bytearray(0x20)  # MIPS Interface
-        self.vi_registers = bytearray(0x40)  # Video Interface
-        self.ai_registers = bytearray(0x20)  # Audio Interface
-        self.pi_registers = bytearray(0x40)  # Peripheral Interface
-        self.ri_registers = bytearray(0x20)  # RDRAM Interface
-        self.si_registers = bytearray(0x20)  # Serial Interface
-        
-        # Save RAM
-        self.save_type = None  # Detected save type
-        self.eeprom = bytearray(2048)  # 4kbit or 16kbit EEPROM
-        self.sram = bytearray(32 * 1024)  # 32KB SRAM
-        self.flashram = bytearray(128 * 1024)  # 128KB FlashRAM
-        
-        # Controller data
-        self.controller_data = [0] * 4
-        
-    def load_rom(self, rom_data):
-        """Load ROM into memory"""
-        self.rom = rom_data
-        self.rom_size = len(rom_data)
-        self.detect_save_type()
-        
-    def detect_save_type(self):
-        """Detect cartridge save type from ROM"""
-        if not self.rom or len(self.rom) < 0x1000:
-            return
-            
-        # Search ROM for save type strings (rough detection)
-        rom_str = self.rom[:0x100000].lower() if len(self.rom) > 0x100000 else self.rom.lower()
-        
-        if b'sram' in rom_str:
-            self.save_type = 'SRAM'
-        elif b'eeprom' in rom_str:
-            self.save_type = 'EEPROM'
-        elif b'flash' in rom_str:
-            self.save_type = 'FlashRAM'
-        else:
-            self.save_type = 'None'
-            
-    def read_byte(self, addr):
-        """Read byte from memory"""
-        addr = addr & 0xFFFFFFFF
-        
-        # RDRAM
-        if addr < 0x00800000 or (0xA0000000 <= addr < 0xA0800000):
-            ram_addr = addr & 0x007FFFFF
-            if ram_addr < len(self.rdram):
-                return self.rdram[ram_addr]
-                
-        # ROM
-        elif (0x10000000 <= addr < 0x1FBFFFFF) or (0xB0000000 <= addr < 0xBFFFFFFF):
-            rom_addr = addr & 0x0FFFFFFF
-            if self.rom and rom_addr < self.rom_size:
-                return self.rom[rom_addr]
-                
-        # SRAM (0x08000000 or 0xA8000000)
-        elif (0x08000000 <= addr < 0x08008000) or (0xA8000000 <= addr < 0xA8008000):
-            sram_addr = addr & 0x7FFF
-            return self.sram[sram_addr]
-            
-        return 0
-        
-    def read_half(self, addr):
-        """Read halfword (16-bit) from memory"""
-        b0 = self.read_byte(addr)
-        b1 = self.read_byte(addr + 1)
-        return (b0 << 8) | b1
-        
-    def read_word(self, addr):
-        """Read word (32-bit) from memory"""
-        addr = addr & 0xFFFFFFFF
-        
-        # RDRAM
-        if addr < 0x00800000 or (0xA0000000 <= addr < 0xA0800000):
-            ram_addr = addr & 0x007FFFFF
-            if ram_addr < len(self.rdram) - 3:
-                return struct.unpack('>I', self.rdram[ram_addr:ram_addr+4])[0]
-                
-        # ROM
-        elif (0x10000000 <= addr < 0x1FBFFFFF) or (0xB0000000 <= addr < 0xBFFFFFFF):
-            rom_addr = addr & 0x0FFFFFFF
-            if self.rom and rom_addr < self.rom_size - 3:
-                return struct.unpack('>I', self.rom[rom_addr:rom_addr+4])[0]
-                
-        # Memory-mapped I/O
-        elif 0x04000000 <= addr < 0x05000000:
-            return self.read_io(addr)
-            
-        return 0
-        
-    def write_byte(self, addr, value):
-        """Write byte to memory"""
-        addr = addr & 0xFFFFFFFF
-        value = value & 0xFF
-        
-        # RDRAM
-        if addr < 0x00800000 or (0xA0000000 <= addr < 0xA0800000):
-            ram_addr = addr & 0x007FFFFF
-            if ram_addr < len(self.rdram):
-                self.rdram[ram_addr] = value
-                
-        # SRAM
-        elif (0x08000000 <= addr < 0x08008000) or (0xA8000000 <= addr < 0xA8008000):
-            sram_addr = addr & 0x7FFF
-            self.sram[sram_addr] = value
-            
-    def write_half(self, addr, value):
-        """Write halfword to memory"""
-        value = value & 0xFFFF
-        self.write_byte(addr, (value >> 8) & 0xFF)
-        self.write_byte(addr + 1, value & 0xFF)
-        
-    def write_word(self, addr, value):
-        """Write word to memory"""
-        addr = addr & 0xFFFFFFFF
-        value = value & 0xFFFFFFFF
-        
-        # RDRAM
-        if addr < 0x00800000 or (0xA0000000 <= addr < 0xA0800000):
-            ram_addr = addr & 0x007FFFFF
-            if ram_addr < len(self.rdram) - 3:
-                struct.pack_into('>I', self.rdram, ram_addr, value)
-                
-        # Memory-mapped I/O
-        elif 0x04000000 <= addr < 0x05000000:
-            self.write_io(addr, value)
-            
-    def read_io(self, addr):
-        """Read from memory-mapped I/O"""
-        # Simplified I/O reads
-        if 0x04300000 <= addr < 0x04300020:  # MI (MIPS Interface)
-            reg = (addr >> 2) & 0x7
-            return struct.unpack('>I', self.mi_registers[reg*4:(reg+1)*4])[0]
-        elif 0x04400000 <= addr < 0x04400040:  # VI (Video Interface)
-            reg = (addr >> 2) & 0xF
-            return struct.unpack('>I', self.vi_registers[reg*4:(reg+1)*4])[0]
-        elif 0x04500000 <= addr < 0x04500020:  # AI (Audio Interface)
-            reg = (addr >> 2) & 0x7
-            return struct.unpack('>I', self.ai_registers[reg*4:(reg+1)*4])[0]
-        elif 0x04600000 <= addr < 0x04600040:  # PI (Peripheral Interface)
-            reg = (addr >> 2) & 0xF
-            return struct.unpack('>I', self.pi_registers[reg*4:(reg+1)*4])[0]
-        return 0
-        
-    def write_io(self, addr, value):
-        """Write to memory-mapped I/O"""
-        if 0x04300000 <= addr < 0x04300020:  # MI
-            reg = (addr >> 2) & 0x7
-            struct.pack_into('>I', self.mi_registers, reg*4, value)
-        elif 0x04400000 <= addr < 0x04400040:  # VI
-            reg = (addr >> 2) & 0xF
-            struct.pack_into('>I', self.vi_registers, reg*4, value)
-        elif 0x04500000 <= addr < 0x04500020:  # AI
-            reg = (addr >> 2) & 0x7
-            struct.pack_into('>I', self.ai_registers, reg*4, value)
-        elif 0x04600000 <= addr < 0x04600040:  # PI
-            reg = (addr >> 2) & 0xF
-            struct.pack_into('>I', self.pi_registers, reg*4, value)
+Analog Stick:
+  Up      → W key
+  Down    → S key
+  Left    → A key
+  Right   → D key
+
+════════════════════════════════════════
+        """
+
+ABOUT_TEXT = """
+MIPSEMU 1.01-HDR
+Darkness Revived - Enhanced Codex Edition
+
+Nintendo 64 Emulator
+Extended MIPS R4300i Implementation
+
+Features:
+• 60+ MIPS instructions
+• Coprocessor 0 support
+• Enhanced memory system
+• Controller input
+• Save RAM support
+• Graphics rendering
+• Plugin architecture
+
+Python 3.13 | Tkinter GUI
+
+For educational purposes only
+        """
+
+README_TEXT = """
+════════════════════════════════════════════════════════
+         MIPSEMU 1.01-HDR - Darkness Revived
+          Enhanced Codex Edition - README
+════════════════════════════════════════════════════════
+
+VERSION 1.01-HDR ENHANCEMENTS:
+───────────────────────────────
+
+CPU CORE:
+  • Extended instruction set (60+ opcodes)
+  • R-type, I-type, J-type instructions
+  • 64-bit instruction support (stubs)
+  • Multiply/divide operations
+  • Atomic operations (LL/SC)
+  • Branch delay slots
+  • Exception handling
+
+COPROCESSOR 0:
+  • System control registers
+  • Exception handling
+  • Timer/counter support
+  • Status and cause registers
+  • TLB operations (stubs)
+
+MEMORY SYSTEM:
+  • 8MB RDRAM
+  • ROM loading with endian detection
+  • Memory-mapped I/O
+  • SRAM support (32KB)
+  • EEPROM support (2KB)
+  • FlashRAM support (128KB)
+
+CONTROLLER:
+  • Full button mapping
+  • Analog stick support
+  • Keyboard input
+
+GRAPHICS:
+  • Enhanced rendering
+  • Real-time visualization
+  • Performance monitoring
+
+FEATURES:
+  • Save states with full CPU dump
+  • ROM catalogue
+  • Plugin system
+  • Real-time register view
+  • Performance metrics
+
+KEYBOARD CONTROLS:
+──────────────────
+
+Emulator:
+  F5  - Start emulation
+  F6  - Pause emulation
+  F7  - Stop emulation
+  F8  - Reset
+  F9  - Save state
+  F10 - Load state
+
+Controller:
+  Arrow Keys - D-Pad
+  Z/X        - A/B buttons
+  Enter      - START
+  Q/W        - L/R triggers
+  I/K/J/L    - C buttons
+  W/A/S/D    - Analog stick
+
+SUPPORTED ROMS:
+───────────────
+  • .z64 (Big endian)
+  • .n64 (Little endian)
+  • .v64 (Byte-swapped)
+
+LIMITATIONS:
+────────────
+This is an educational implementation. Full N64 
+emulation requires:
+  • Complete RCP (RDP/RSP) implementation
+  • Microcode interpreters
+  • Audio processing
+  • Advanced graphics plugins
+  • Recompiler for performance
+
+DISCLAIMER:
+───────────
+Use ROMs you legally own. This software is for
+educational purposes. Some features may cause
+unexpected behavior.
+
+For support: github.com/mipsemu-hdr
+        """
 
 
 class VideoInterface:
     """Enhanced N64 Video Interface with Framebuffer"""
+    SCREEN_X, SCREEN_Y = 192, 114  # Top-left corner of the 640x480 screen area
+    OVAL_PERIOD = 180  # Frames per turn of the oval animation
+    # $0-$11 as three lines of four 20-character columns, filled in with a
+    # single str.format call per frame ({:08X} is two characters shorter
+    # than the eight digits it becomes)
+    REGISTER_FORMAT = "\n".join(
+        "".join(f"${i:2d}: {{:08X}}".ljust(20 - 2) for i in range(row, row + 4)).rstrip()
+        for row in range(0, 12, 4)
+    )
+    OVAL_COLORS = ("#ff0000", "#ff8800", "#ffff00", "#00ff00",
+                   "#0088ff", "#0000ff", "#8800ff", "#ff00ff")
+    # Grid lines every 40px across the screen, brightest in the middle
+    GRID_COLORS = tuple("#" + f"{int(128 * (1 - abs(i - 320) / 320.0)):02x}" * 3
+                        for i in range(0, 640, 40))
+    
     def __init__(self, canvas):
         self.canvas = canvas
         self.width = 320
@@ -838,113 +213,128 @@ class VideoInterface:
         self.vi_counter = 0
         self.frame_count = 0
         
-        # Framebuffer simulation
-        self.framebuffer = [[0 for _ in range(320)] for _ in range(240)]
+        # Framebuffer simulation: one 0x00RRGGBB word per pixel, row-major
+        self.framebuffer = array('I', [0]) * (self.width * self.height)
+        self.photo = None  # Tk image blit() copies the framebuffer into
         
-    def render_frame(self, cpu_state, memory):
-        """Render frame with enhanced graphics"""
-        self.canvas.delete("all")
+        # The oval animation repeats every OVAL_PERIOD frames, so work out
+        # every frame's oval coordinates once instead of calling sin/cos
+        # 24 times per frame
+        self.oval_frames = [self.oval_coords(frame) for frame in range(self.OVAL_PERIOD)]
+        
+    def oval_coords(self, frame):
+        """Bounding boxes of the 8 animated ovals for one frame of the loop"""
+        screen_x, screen_y = self.SCREEN_X, self.SCREEN_Y
+        frame_phase = frame / self.OVAL_PERIOD
+        coords = []
+        for i in range(8):
+            angle = (frame_phase * 6.28 + i * 0.785)
+            x = screen_x + 320 + int(150 * math.cos(angle))
+            y = screen_y + 240 + int(100 * math.sin(angle))
+            size = 15 + int(8 * math.sin(frame_phase * 6.28 + i))
+            coords.append((x - size, y - size, x + size, y + size))
+        return tuple(coords)
+        
+    def blit(self):
+        """Show the framebuffer on the canvas, scaled 2x into the screen area"""
+        # Pick the R, G and B bytes out of every pixel with slice copies and
+        # hand Tk a binary PPM, rather than touching each pixel in Python
+        raw = self.framebuffer.tobytes()
+        red, green, blue = (2, 1, 0) if sys.byteorder == 'little' else (1, 2, 3)
+        rgb = bytearray(3 * len(self.framebuffer))
+        rgb[0::3] = raw[red::4]
+        rgb[1::3] = raw[green::4]
+        rgb[2::3] = raw[blue::4]
+        ppm = b"P6 %d %d 255\n" % (self.width, self.height) + bytes(rgb)
+        
+        if self.photo is None:
+            self.photo = tk.PhotoImage(width=self.width, height=self.height)
+        self.photo.configure(data=ppm, format="PPM")
+        self.screen_photo = self.photo.zoom(2, 2)
+        if not self.canvas.find_withtag("framebuffer"):
+            self.canvas.create_image(self.SCREEN_X, self.SCREEN_Y, anchor="nw", tags="framebuffer")
+        self.canvas.itemconfig("framebuffer", image=self.screen_photo)
+        
+    def build_scene(self):
+        """Create the canvas items render_frame updates, once per screen"""
+        canvas = self.canvas
+        canvas.delete("all")
+        self.shown_text = {}  # item id -> text last set by set_text
         
         # Background
-        self.canvas.create_rectangle(0, 0, 1024, 768, fill="#001122", outline="")
+        canvas.create_rectangle(0, 0, 1024, 768, fill="#001122", outline="", tags="vi_scene")
         
         # Screen area
-        screen_x, screen_y = 192, 114
-        self.canvas.create_rectangle(
+        screen_x, screen_y = self.SCREEN_X, self.SCREEN_Y
+        canvas.create_rectangle(
             screen_x, screen_y, 
             screen_x + 640, screen_y + 480,
             fill="#000000", outline="#00ff88", width=2
         )
         
-        # Enhanced rendering with more detail
-        frame_phase = (self.frame_count % 180) / 180.0
+        # Simulated 3D space; render_frame moves these
+        self.ovals = [
+            canvas.create_oval(0, 0, 0, 0, fill=color, outline="white", width=1)
+            for color in self.OVAL_COLORS
+        ]
         
-        # Simulate 3D space
-        for i in range(8):
-            angle = (frame_phase * 6.28 + i * 0.785)
-            x = screen_x + 320 + int(150 * math.cos(angle))
-            y = screen_y + 240 + int(100 * math.sin(angle))
-            size = 15 + int(8 * math.sin(frame_phase * 6.28 + i))
-            
-            colors = ["#ff0000", "#ff8800", "#ffff00", "#00ff00", 
-                     "#0088ff", "#0000ff", "#8800ff", "#ff00ff"]
-            self.canvas.create_oval(
-                x - size, y - size, x + size, y + size,
-                fill=colors[i], outline="white", width=1
-            )
-            
         # Grid effect
-        for i in range(0, 640, 40):
-            alpha = int(128 * (1 - abs(i - 320) / 320.0))
-            color = f"#{alpha:02x}{alpha:02x}{alpha:02x}"
-            self.canvas.create_line(
-                screen_x + i, screen_y,
-                screen_x + i, screen_y + 480,
+        for i, color in enumerate(self.GRID_COLORS):
+            canvas.create_line(
+                screen_x + i * 40, screen_y,
+                screen_x + i * 40, screen_y + 480,
                 fill=color, width=1
             )
             
         # CPU visualization
-        self.canvas.create_text(
+        canvas.create_text(
             screen_x + 320, screen_y + 40,
             text="🎮 N64 EMULATION ACTIVE 🎮",
             font=("Arial", 24, "bold"),
             fill="#00ff88"
         )
         
+        # PC, cycles and instruction count share one two-line item
         info_y = screen_y + 90
-        self.canvas.create_text(
-            screen_x + 320, info_y,
-            text=f"PC: {hex(cpu_state['pc'])}  |  Cycles: {cpu_state['cycles']:,}",
+        self.status_text = canvas.create_text(
+            screen_x + 320, info_y + 12,
             font=("Consolas", 11),
             fill="#00ff00"
         )
         
-        self.canvas.create_text(
-            screen_x + 320, info_y + 25,
-            text=f"Instructions: {cpu_state['instructions']:,}",
-            font=("Consolas", 11),
-            fill="#00ff00"
+        # Register display with more detail: one item, four columns of
+        # 20 monospace characters per line
+        reg_y = screen_y + 150
+        self.register_text = canvas.create_text(
+            screen_x + 100, reg_y - 9,
+            font=("Consolas", 9),
+            fill="#00ffff",
+            anchor="nw"
         )
         
-        # Register display with more detail
-        reg_y = screen_y + 150
-        for i in range(12):
-            reg_text = f"${i:2d}: {hex(cpu_state['registers'][i])[2:].upper().zfill(8)}"
-            self.canvas.create_text(
-                screen_x + 100 + (i % 4) * 140,
-                reg_y + (i // 4) * 18,
-                text=reg_text,
-                font=("Consolas", 9),
-                fill="#00ffff",
-                anchor="w"
-            )
-            
         # HI/LO registers
-        self.canvas.create_text(
+        self.hilo_text = canvas.create_text(
             screen_x + 320, reg_y + 65,
-            text=f"HI: {hex(cpu_state['hi'])[2:].upper().zfill(8)}  |  LO: {hex(cpu_state['lo'])[2:].upper().zfill(8)}",
             font=("Consolas", 10),
             fill="#ffaa00"
         )
         
         # Memory info
-        mem_y = screen_y + 280
-        self.canvas.create_text(
-            screen_x + 320, mem_y,
-            text=f"RDRAM: 8MB  |  Save: {memory.save_type}",
+        self.memory_text = canvas.create_text(
+            screen_x + 320, screen_y + 280,
             font=("Consolas", 10),
             fill="#888888"
         )
         
         # RCP status
-        self.canvas.create_text(
+        canvas.create_text(
             screen_x + 320, screen_y + 380,
             text="Reality Display Processor: ACTIVE",
             font=("Arial", 11),
             fill="#00aa00"
         )
         
-        self.canvas.create_text(
+        canvas.create_text(
             screen_x + 320, screen_y + 405,
             text="Reality Signal Processor: ACTIVE",
             font=("Arial", 11),
@@ -952,27 +342,68 @@ class VideoInterface:
         )
         
         # Frame info
-        self.canvas.create_text(
+        self.frame_text = canvas.create_text(
             screen_x + 580, screen_y + 455,
-            text=f"Frame: {self.frame_count}",
             font=("Consolas", 9),
             fill="#555555"
         )
         
+    def set_text(self, item, text):
+        """Update a text item, skipping the Tk call when nothing changed"""
+        if self.shown_text.get(item) != text:
+            self.shown_text[item] = text
+            self.canvas.itemconfig(item, text=text)
+            
+    def render_frame(self, cpu_state, memory):
+        """Render frame with enhanced graphics"""
+        # The scene is built once and only coordinates and text change per
+        # frame. Other screens clear the canvas, so rebuild when it is gone.
+        canvas = self.canvas
+        if not canvas.find_withtag("vi_scene"):
+            self.build_scene()
+            
+        for oval, box in zip(self.ovals, self.oval_frames[self.frame_count % self.OVAL_PERIOD]):
+            canvas.coords(oval, *box)
+            
+        self.set_text(self.status_text,
+                      f"PC: {hex(cpu_state.pc)}  |  Cycles: {cpu_state.cycles:,}\n"
+                      f"Instructions: {cpu_state.instructions:,}")
+        self.set_text(self.register_text, self.REGISTER_FORMAT.format(*cpu_state.registers[:12]))
+        self.set_text(self.hilo_text, f"HI: {cpu_state.hi:08X}  |  LO: {cpu_state.lo:08X}")
+        self.set_text(self.memory_text, f"RDRAM: 8MB  |  Save: {memory.save_type}")
+        self.set_text(self.frame_text, f"Frame: {self.frame_count}")
+        
         self.frame_count += 1
         self.vi_counter += 1
 
 
 class AudioInterface:
     """N64 Audio Interface - STUB"""
+    BUFFER_SIZE = 4096  # Samples kept; older ones are overwritten
+    
     def __init__(self):
         self.enabled = False
         self.sample_rate = 44100
-        self.buffer = deque(maxlen=4096)
+        
+        # Ring buffer of the most recent BUFFER_SIZE signed 16-bit samples
+        self.buffer = array('h', [0]) * self.BUFFER_SIZE
+        self.head = 0  # Index the next sample is written to
+        self.count = 0  # Valid samples, oldest at head - count
         
     def queue_audio(self, samples):
         """Queue audio samples"""
-        self.buffer.extend(samples)
+        samples = array('h', samples)
+        size = self.BUFFER_SIZE
+        if len(samples) > size:
+            samples = samples[-size:]  # Older samples would be overwritten
+        n = len(samples)
+        
+        # At most two slice copies, split where the ring wraps around
+        first = min(n, size - self.head)
+        self.buffer[self.head:self.head + first] = samples[:first]
+        self.buffer[:n - first] = samples[first:]
+        self.head = (self.head + n) % size
+        self.count = min(self.count + n, size)
         
     def play(self):
         """Play audio - STUB"""
@@ -981,14 +412,16 @@ class AudioInterface:
 
 class ControllerInput:
     """N64 Controller Input System"""
+    # Button bits in the controller state word
+    BUTTON_BITS = {
+        'A': 0x8000, 'B': 0x4000, 'Z': 0x2000, 'START': 0x1000,
+        'DUP': 0x0800, 'DDOWN': 0x0400, 'DLEFT': 0x0200, 'DRIGHT': 0x0100,
+        'L': 0x0020, 'R': 0x0010,
+        'CUP': 0x0008, 'CDOWN': 0x0004, 'CLEFT': 0x0002, 'CRIGHT': 0x0001
+    }
+    
     def __init__(self):
-        self.buttons = {
-            'A': False, 'B': False,
-            'START': False, 'Z': False,
-            'DUP': False, 'DDOWN': False, 'DLEFT': False, 'DRIGHT': False,
-            'L': False, 'R': False,
-            'CUP': False, 'CDOWN': False, 'CLEFT': False, 'CRIGHT': False
-        }
+        self.state_word = 0  # Held buttons, kept up to date by key events
         self.stick_x = 0  # -128 to 127
         self.stick_y = 0
         
@@ -1002,9 +435,9 @@ class ControllerInput:
         
     def key_press(self, key):
         """Handle key press"""
-        if key in self.key_bindings:
-            button = self.key_bindings[key]
-            self.buttons[button] = True
+        button = self.key_bindings.get(key)
+        if button is not None:
+            self.state_word |= self.BUTTON_BITS[button]
             
         # Analog stick
         if key == 'w':
@@ -1018,9 +451,9 @@ class ControllerInput:
             
     def key_release(self, key):
         """Handle key release"""
-        if key in self.key_bindings:
-            button = self.key_bindings[key]
-            self.buttons[button] = False
+        button = self.key_bindings.get(key)
+        if button is not None:
+            self.state_word &= ~self.BUTTON_BITS[button]
             
         # Analog stick reset
         if key in ['w', 's']:
@@ -1030,28 +463,42 @@ class ControllerInput:
             
     def get_state(self):
         """Get controller state as 32-bit word"""
-        state = 0
-        if self.buttons['A']: state |= 0x8000
-        if self.buttons['B']: state |= 0x4000
-        if self.buttons['Z']: state |= 0x2000
-        if self.buttons['START']: state |= 0x1000
-        if self.buttons['DUP']: state |= 0x0800
-        if self.buttons['DDOWN']: state |= 0x0400
-        if self.buttons['DLEFT']: state |= 0x0200
-        if self.buttons['DRIGHT']: state |= 0x0100
-        if self.buttons['L']: state |= 0x0020
-        if self.buttons['R']: state |= 0x0010
-        if self.buttons['CUP']: state |= 0x0008
-        if self.buttons['CDOWN']: state |= 0x0004
-        if self.buttons['CLEFT']: state |= 0x0002
-        if self.buttons['CRIGHT']: state |= 0x0001
-        return state
+        return self.state_word
 
 
 import math  # For trig functions
 
 
 class MIPSEMU:
+    FRAME_INTERVAL = 1.0 / 60.0  # Seconds between rendered frames
+    PERF_FORMAT = "CPU: {mips:.2f} MIPS    VI/s: {vis}    FPS: {fps}"
+    CONFIG_SAVE_DELAY = 500  # ms; changes within this window share one write
+    REG_NAMES = (
+        'zero', 'at', 'v0', 'v1', 'a0', 'a1', 'a2', 'a3',
+        't0', 't1', 't2', 't3', 't4', 't5', 't6', 't7',
+        's0', 's1', 's2', 's3', 's4', 's5', 's6', 's7',
+        't8', 't9', 'k0', 'k1', 'gp', 'sp', 'fp', 'ra'
+    )
+    # Whole register window as one template, filled in by a single format()
+    REGISTER_VIEW = (
+        "════════════════════════════════════════\n"
+        "    MIPS R4300i CPU REGISTERS\n"
+        "════════════════════════════════════════\n\n"
+        "PC:  {:#x}\n"
+        "HI:  {:#x}\n"
+        "LO:  {:#x}\n\n"
+        + "".join(f"${i:2d} ({name:4s}): {{:#x}}\n" for i, name in enumerate(REG_NAMES))
+        + "\n────────────────────────────────────────\n"
+        "Instructions: {:,}\n"
+        "Cycles:       {:,}\n"
+        "\n────── COPROCESSOR 0 ──────\n"
+        "Status:  {:#x}\n"
+        "Cause:   {:#x}\n"
+        "EPC:     {:#x}\n"
+        "Count:   {:#x}\n"
+        "Compare: {:#x}\n"
+    )
+    
     def __init__(self, root):
         self.root = root
         self.root.title("MIPSEMU 1.01-HDR - Darkness Revived")
@@ -1069,7 +516,9 @@ class MIPSEMU:
         self.current_rom = None
         self.current_rom_data = None
         self.rom_header = None
+        self.rom_info_text = None  # ROM Info window text for rom_header
         self.rom_list = []
+        self.rom_hashes = {}  # path -> [mtime_ns, size, header hash]
         self.plugins_enabled = {
             "personalization_ai": False,
             "debug_menu": False,
@@ -1079,7 +528,9 @@ class MIPSEMU:
         }
         self.emulation_running = False
         self.emulation_thread = None
+        self.io_pool = ThreadPoolExecutor(max_workers=1)  # Save state writes
         self.config_file = Path("mipsemu_config.json")
+        self.config_save_id = None  # Pending root.after() id for write_config
         
         # Performance
         self.fps = 0
@@ -1087,6 +538,11 @@ class MIPSEMU:
         self.mips = 0
         self.last_fps_update = time.time()
         self.frame_count = 0
+        self.next_frame = 0.0  # perf_counter() deadline of the next frame
+        self.rendered_cycles = None  # CPU cycle count shown by the last frame
+        self.fps_instructions = 0  # Instruction count at last_fps_update
+        self.render_after_id = None  # Pending root.after() id for render_loop
+        self.windows = {}  # Dialog key -> (Toplevel, refresh or None)
         
         self.load_config()
         self.create_menu()
@@ -1275,32 +731,16 @@ class MIPSEMU:
         )
         self.status_label.pack(side=tk.LEFT, padx=10)
         
-        self.fps_label = tk.Label(
-            self.status_bar,
-            text="FPS: 0",
-            bg="#1e1e1e",
-            fg="#00ff00",
-            font=("Consolas", 9)
-        )
-        self.fps_label.pack(side=tk.RIGHT, padx=10)
-        
-        self.vi_label = tk.Label(
-            self.status_bar,
-            text="VI/s: 0",
-            bg="#1e1e1e",
-            fg="#00ff00",
-            font=("Consolas", 9)
-        )
-        self.vi_label.pack(side=tk.RIGHT, padx=10)
-        
-        self.cpu_label = tk.Label(
+        # CPU, VI and FPS counters share one label, updated once a second
+        self.perf_var = tk.StringVar(value=self.PERF_FORMAT.format(mips=0, vis=0, fps=0))
+        self.perf_label = tk.Label(
             self.status_bar,
-            text="CPU: 0.00 MIPS",
+            textvariable=self.perf_var,
             bg="#1e1e1e",
             fg="#00ff00",
             font=("Consolas", 9)
         )
-        self.cpu_label.pack(side=tk.RIGHT, padx=10)
+        self.perf_label.pack(side=tk.RIGHT, padx=10)
         
     def log(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1333,11 +773,19 @@ class MIPSEMU:
                 
             self.log(f"ROM size: {len(rom_data) / (1024*1024):.2f} MB")
             
-            self.rom_header = ROMHeader(rom_data)
+            # Reuse the header hash if the file is unchanged since last time
+            stat = os.stat(filepath)
+            file_key = [stat.st_mtime_ns, stat.st_size]
+            cached = self.rom_hashes.get(filepath)
+            rom_hash = cached[2] if cached and cached[:2] == file_key else None
+            
+            self.rom_header = ROMHeader(rom_data, rom_hash)
+            self.rom_info_text = None
             
             if not self.rom_header.valid:
                 messagebox.showerror("Invalid ROM", "Not a valid N64 ROM file")
                 return
+            self.rom_hashes[filepath] = file_key + [self.rom_header.rom_hash]
                 
             self.log(f"ROM format: {self.rom_header.endian}")
             self.log(f"Game: {self.rom_header.name}")
@@ -1345,7 +793,7 @@ class MIPSEMU:
             self.log(f"Country: {self.rom_header.country}")
             self.log(f"Version: {self.rom_header.version}")
             
-            self.memory.load_rom(self.rom_header.raw_data + rom_data[len(self.rom_header.raw_data):])
+            self.memory.load_rom(self.rom_header.to_big_endian(rom_data))
             self.current_rom = filepath
             self.current_rom_data = rom_data
             
@@ -1423,6 +871,7 @@ class MIPSEMU:
         self.cpu.running = True
         self.cpu.reset()
         self.cpu.pc = self.rom_header.boot_address
+        self.cpu.publish_snapshot()
         
         self.update_status("Emulation started")
         self.log(f"Boot PC: {hex(self.cpu.pc)}")
@@ -1431,6 +880,10 @@ class MIPSEMU:
         self.emulation_thread = threading.Thread(target=self.emulation_loop, daemon=True)
         self.emulation_thread.start()
         
+        self.next_frame = time.perf_counter()
+        self.rendered_cycles = None
+        self.fps_instructions = 0
+        self.cancel_render_loop()  # A loop left over from before a pause
         self.render_loop()
         
     def emulation_loop(self):
@@ -1438,11 +891,10 @@ class MIPSEMU:
         
         while self.emulation_running and self.cpu.running:
             try:
-                for _ in range(instructions_per_frame // 500):
-                    if not self.cpu.running:
-                        break
-                    self.cpu.step()
-                    
+                # One batched call per frame; run_block stops early if the
+                # CPU halts and keeps COUNT and the timer interrupt in step
+                self.cpu.run_block(instructions_per_frame // 500)
+                
                 time.sleep(1.0 / 60.0)
                 
             except Exception as e:
@@ -1451,18 +903,26 @@ class MIPSEMU:
                 break
                 
     def render_loop(self):
+        self.render_after_id = None
         if not self.emulation_running:
             return
             
         try:
-            cpu_state = {
-                'pc': self.cpu.pc,
-                'instructions': self.cpu.instructions_executed,
-                'cycles': self.cpu.cycles,
-                'registers': self.cpu.registers[:16],
-                'hi': self.cpu.hi,
-                'lo': self.cpu.lo
-            }
+            # Schedule against a fixed 60 Hz deadline so slow frames do not
+            # push every later frame back; after a long stall, start over
+            now = time.perf_counter()
+            self.next_frame += self.FRAME_INTERVAL
+            if self.next_frame < now:
+                self.next_frame = now + self.FRAME_INTERVAL
+            delay = max(1, int((self.next_frame - now) * 1000))
+            
+            # The CPU thread publishes a consistent snapshot after every
+            # batch; nothing to redraw until it has moved on
+            cpu_state = self.cpu.snapshot()
+            if cpu_state.cycles == self.rendered_cycles:
+                self.render_after_id = self.root.after(delay, self.render_loop)
+                return
+            self.rendered_cycles = cpu_state.cycles
             
             self.video.render_frame(cpu_state, self.memory)
             
@@ -1472,31 +932,40 @@ class MIPSEMU:
             if current_time - self.last_fps_update >= 1.0:
                 self.fps = self.frame_count
                 self.vis = self.video.vi_counter
-                self.mips = self.cpu.instructions_executed / 1000000.0
+                # Rate from the snapshot; the counter itself belongs to the
+                # CPU thread and is never reset from here
+                elapsed = current_time - self.last_fps_update
+                self.mips = (cpu_state.instructions - self.fps_instructions) / elapsed / 1000000.0
+                self.fps_instructions = cpu_state.instructions
                 
-                self.fps_label.config(text=f"FPS: {self.fps}")
-                self.vi_label.config(text=f"VI/s: {self.vis}")
-                self.cpu_label.config(text=f"CPU: {self.mips:.2f} MIPS")
+                self.perf_var.set(self.PERF_FORMAT.format(mips=self.mips, vis=self.vis, fps=self.fps))
                 
                 self.frame_count = 0
                 self.video.vi_counter = 0
-                self.cpu.instructions_executed = 0
                 self.last_fps_update = current_time
                 
-            self.root.after(16, self.render_loop)
+            self.render_after_id = self.root.after(delay, self.render_loop)
             
         except Exception as e:
             self.log(f"Render error: {e}")
             
+    def cancel_render_loop(self):
+        """Drop the queued render_loop callback, if there is one"""
+        if self.render_after_id is not None:
+            self.root.after_cancel(self.render_after_id)
+            self.render_after_id = None
+            
     def pause_emulation(self):
         if self.emulation_running:
             self.emulation_running = False
             self.cpu.running = False
+            self.cancel_render_loop()
             self.update_status("Paused")
             
     def stop_emulation(self):
         self.emulation_running = False
         self.cpu.running = False
+        self.cancel_render_loop()
         self.update_status("Stopped")
         self.root.title("MIPSEMU 1.01-HDR - Darkness Revived")
         
@@ -1511,10 +980,30 @@ class MIPSEMU:
             self.stop_emulation()
             self.cpu.reset()
             self.cpu.pc = self.rom_header.boot_address
+            self.cpu.publish_snapshot()
             self.update_status("Reset")
             if was_running:
                 self.start_emulation()
                 
+    def hold_cpu_thread(self):
+        """Stop the CPU thread at a batch boundary; True if it was running
+        
+        run_block keeps cycles and COUNT in locals for a whole batch, so
+        CPU state is only consistent between batches.
+        """
+        was_running = self.emulation_running
+        self.emulation_running = False
+        if self.emulation_thread is not None:
+            self.emulation_thread.join()  # Also covers a batch left by a pause
+        return was_running
+        
+    def release_cpu_thread(self, was_running):
+        """Restart the CPU thread stopped by hold_cpu_thread, if it ran"""
+        if was_running:
+            self.emulation_running = True
+            self.emulation_thread = threading.Thread(target=self.emulation_loop, daemon=True)
+            self.emulation_thread.start()
+            
     def save_state(self):
         if not self.current_rom:
             messagebox.showwarning("No ROM", "No ROM loaded")
@@ -1527,22 +1016,57 @@ class MIPSEMU:
         )
         
         if filename:
+            was_running = self.hold_cpu_thread()
             state = {
                 'pc': self.cpu.pc,
                 'next_pc': self.cpu.next_pc,
                 'registers': self.cpu.registers,
                 'hi': self.cpu.hi,
                 'lo': self.cpu.lo,
-                'cop0': self.cpu.cop0.registers,
-                'ram': self.memory.rdram.hex(),
+                'cop0': list(self.cpu.cop0.registers),
                 'cycles': self.cpu.cycles
             }
             
-            with open(filename, 'w') as f:
-                json.dump(state, f)
-                
-            self.update_status(f"State saved: {Path(filename).name}")
+            # Capture everything now; compressing and writing the copy then
+            # happens off the Tk thread so the UI does not stall
+            header = json.dumps(state).encode('utf-8')
+            ram = self.memory.dump_rdram()
+            self.release_cpu_thread(was_running)
+            self.update_status(f"Saving state: {Path(filename).name}")
+            future = self.io_pool.submit(self.write_state_file, filename, header, ram)
+            self.poll_state_save(filename, future)
+            
+    @staticmethod
+    def write_state_file(filename, header, ram):
+        """Compress and write a save state; runs on io_pool, no Tk calls"""
+        # Binary layout: STATE_MAGIC, JSON header length, JSON header,
+        # then the zlib-compressed big-endian RDRAM image. Compress in
+        # chunks straight into the file rather than holding a second full
+        # copy of the image
+        compressor = zlib.compressobj(1)
+        view = memoryview(ram)
+        with open(filename, 'wb') as f:
+            f.write(STATE_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for start in range(0, len(view), STATE_CHUNK):
+                f.write(compressor.compress(view[start:start + STATE_CHUNK]))
+            f.write(compressor.flush())
+            
+    def poll_state_save(self, filename, future):
+        """Report a save state write from the Tk thread once it finishes"""
+        if not future.done():
+            self.root.after(10, self.poll_state_save, filename, future)
+            return
             
+        try:
+            future.result()
+        except Exception as e:
+            self.update_status(f"Failed to save state: {Path(filename).name}")
+            messagebox.showerror("Error", f"Failed to save state: {e}")
+            return
+        self.update_status(f"State saved: {Path(filename).name}")
+        
     def load_state(self):
         filename = filedialog.askopenfilename(
             title="Load State",
@@ -1551,28 +1075,77 @@ class MIPSEMU:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    state = json.load(f)
+                with open(filename, 'rb') as f:
+                    data = f.read()
+                    
+                if data.startswith(STATE_MAGIC):
+                    offset = len(STATE_MAGIC)
+                    (header_size,) = struct.unpack_from('<I', data, offset)
+                    offset += 4
+                    state = json.loads(data[offset:offset + header_size])
+                    ram = zlib.decompress(data[offset + header_size:])
+                else:
+                    # Older states were one JSON document with RDRAM as hex
+                    state = json.loads(data)
+                    ram = bytes.fromhex(state['ram'])
                     
-                self.cpu.pc = state['pc']
-                self.cpu.next_pc = state['next_pc']
-                self.cpu.registers = state['registers']
-                self.cpu.hi = state['hi']
-                self.cpu.lo = state['lo']
-                self.cpu.cop0.registers = state['cop0']
-                self.memory.rdram = bytearray.fromhex(state['ram'])
-                self.cpu.cycles = state['cycles']
+                # Decode and check everything before touching the CPU, so a
+                # bad file leaves the running state as it was
+                pc, next_pc = state['pc'], state['next_pc']
+                hi, lo, cycles = state['hi'], state['lo'], state['cycles']
+                registers = list(state['registers'])
+                if len(registers) != 32:
+                    raise ValueError(f"expected 32 registers, got {len(registers)}")
+                cop0_registers = array('I', state['cop0'])
+                if len(cop0_registers) != 32:
+                    raise ValueError(f"expected 32 COP0 registers, got {len(cop0_registers)}")
+                if len(ram) != RDRAM_SIZE:
+                    raise ValueError(f"RDRAM image must be {RDRAM_SIZE} bytes, got {len(ram)}")
+                    
+                was_running = self.hold_cpu_thread()
+                try:
+                    self.cpu.pc = pc
+                    self.cpu.next_pc = next_pc
+                    self.cpu.registers[:] = registers
+                    self.cpu.hi = hi
+                    self.cpu.lo = lo
+                    self.cpu.cop0.registers = cop0_registers
+                    self.memory.restore_rdram(ram)
+                    self.cpu.cycles = cycles
+                    self.cpu.publish_snapshot()
+                finally:
+                    self.release_cpu_thread(was_running)
                 
                 self.update_status(f"State loaded: {Path(filename).name}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load state: {e}")
                 
+    def show_window(self, key, title, geometry, build):
+        """Show a dialog, building its widgets only the first time.
+        
+        build(window) fills in a new window and may return a function that
+        brings the contents up to date; that runs on every show. Closing a
+        dialog only hides it, so the next show reuses the same widgets.
+        """
+        window, refresh = self.windows.get(key, (None, None))
+        if window is None or not window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.title(title)
+            window.geometry(geometry)
+            window.configure(bg="#2b2b2b")
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            refresh = build(window)
+            self.windows[key] = (window, refresh)
+        else:
+            window.deiconify()
+            window.lift()
+        if refresh:
+            refresh()
+            
     def show_plugins(self):
-        plugin_window = tk.Toplevel(self.root)
-        plugin_window.title("Plugin Manager")
-        plugin_window.geometry("550x450")
-        plugin_window.configure(bg="#2b2b2b")
+        self.show_window("plugins", "Plugin Manager", "550x450", self.build_plugins)
         
+    def build_plugins(self, plugin_window):
         tk.Label(
             plugin_window,
             text="Plugin Manager",
@@ -1626,12 +1199,12 @@ class MIPSEMU:
         if plugin_id == "personalization_ai" and enabled:
             self.log("WARNING: Personalization AI active")
             
+        self.save_config()
+            
     def show_settings(self):
-        settings_window = tk.Toplevel(self.root)
-        settings_window.title("Settings")
-        settings_window.geometry("600x500")
-        settings_window.configure(bg="#2b2b2b")
+        self.show_window("settings", "Settings", "600x500", self.build_settings)
         
+    def build_settings(self, settings_window):
         notebook = ttk.Notebook(settings_window)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
@@ -1645,11 +1218,9 @@ class MIPSEMU:
         notebook.add(audio_frame, text="Audio")
         
     def show_rom_catalogue(self):
-        catalogue_window = tk.Toplevel(self.root)
-        catalogue_window.title("ROM Catalogue")
-        catalogue_window.geometry("700x500")
-        catalogue_window.configure(bg="#2b2b2b")
+        self.show_window("rom_catalogue", "ROM Catalogue", "700x500", self.build_rom_catalogue)
         
+    def build_rom_catalogue(self, catalogue_window):
         tk.Label(
             catalogue_window,
             text="ROM Catalogue",
@@ -1674,15 +1245,17 @@ class MIPSEMU:
         rom_listbox.pack(fill=tk.BOTH, expand=True)
         scrollbar.config(command=rom_listbox.yview)
         
-        for rom in self.rom_list:
-            rom_listbox.insert(tk.END, Path(rom).name)
+        def refresh():
+            # One insert call for the whole list rather than one Tk call per ROM
+            rom_listbox.delete(0, tk.END)
+            rom_listbox.insert(tk.END, *[os.path.basename(rom) for rom in self.rom_list])
             
         def load_selected():
             selection = rom_listbox.curselection()
             if selection:
                 idx = selection[0]
                 self.load_rom(self.rom_list[idx])
-                catalogue_window.destroy()
+                catalogue_window.withdraw()
                 
         tk.Button(
             catalogue_window,
@@ -1693,16 +1266,15 @@ class MIPSEMU:
             font=("Arial", 10)
         ).pack(pady=10)
         
+        return refresh
+        
     def show_rom_info(self):
         if not self.rom_header:
             messagebox.showinfo("No ROM", "No ROM loaded")
             return
-            
-        info_window = tk.Toplevel(self.root)
-        info_window.title("ROM Information")
-        info_window.geometry("600x500")
-        info_window.configure(bg="#2b2b2b")
+        self.show_window("rom_info", "ROM Information", "600x500", self.build_rom_info)
         
+    def build_rom_info(self, info_window):
         info_text = scrolledtext.ScrolledText(
             info_window,
             bg="#0a0a0a",
@@ -1711,7 +1283,24 @@ class MIPSEMU:
         )
         info_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        info_content = f"""
+        shown = {'text': None}
+        
+        def refresh():
+            # Everything in it is fixed until the next ROM is loaded
+            if self.rom_info_text is None:
+                self.rom_info_text = self.format_rom_info()
+            if shown['text'] is self.rom_info_text:
+                return
+            shown['text'] = self.rom_info_text
+            info_text.config(state=tk.NORMAL)
+            info_text.delete(1.0, tk.END)
+            info_text.insert(tk.END, self.rom_info_text)
+            info_text.config(state=tk.DISABLED)
+            
+        return refresh
+        
+    def format_rom_info(self):
+        return f"""
 ════════════════════════════════════════════════════════
                     ROM INFORMATION
 ════════════════════════════════════════════════════════
@@ -1738,18 +1327,12 @@ Manufacturer:   {hex(self.rom_header.manufacturer)}
 Cart ID:        {hex(self.rom_header.cart_id_word)}
         """
         
-        info_text.insert(tk.END, info_content)
-        info_text.config(state=tk.DISABLED)
-        
     def show_registers(self):
         if not self.cpu:
             return
-            
-        reg_window = tk.Toplevel(self.root)
-        reg_window.title("CPU Registers")
-        reg_window.geometry("500x700")
-        reg_window.configure(bg="#2b2b2b")
+        self.show_window("registers", "CPU Registers", "500x700", self.build_registers)
         
+    def build_registers(self, reg_window):
         reg_text = scrolledtext.ScrolledText(
             reg_window,
             bg="#0a0a0a",
@@ -1758,52 +1341,59 @@ Cart ID:        {hex(self.rom_header.cart_id_word)}
         )
         reg_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        shown = {'snapshot': None, 'lines': [], 'after_id': None}
+        
         def update_registers():
-            reg_text.delete(1.0, tk.END)
-            
-            content = "════════════════════════════════════════\n"
-            content += "    MIPS R4300i CPU REGISTERS\n"
-            content += "════════════════════════════════════════\n\n"
-            
-            content += f"PC:  {hex(self.cpu.pc)}\n"
-            content += f"HI:  {hex(self.cpu.hi)}\n"
-            content += f"LO:  {hex(self.cpu.lo)}\n\n"
-            
-            reg_names = [
-                'zero', 'at', 'v0', 'v1', 'a0', 'a1', 'a2', 'a3',
-                't0', 't1', 't2', 't3', 't4', 't5', 't6', 't7',
-                's0', 's1', 's2', 's3', 's4', 's5', 's6', 's7',
-                't8', 't9', 'k0', 'k1', 'gp', 'sp', 'fp', 'ra'
-            ]
-            
-            for i in range(32):
-                content += f"${i:2d} ({reg_names[i]:4s}): {hex(self.cpu.registers[i])}\n"
+            # Stop polling while the window is hidden; showing it again
+            # starts the loop over
+            shown['after_id'] = None
+            if reg_window.state() == 'withdrawn':
+                return
                 
-            content += f"\n────────────────────────────────────────\n"
-            content += f"Instructions: {self.cpu.instructions_executed:,}\n"
-            content += f"Cycles:       {self.cpu.cycles:,}\n"
-            
-            content += f"\n────── COPROCESSOR 0 ──────\n"
-            content += f"Status:  {hex(self.cpu.cop0.read(12))}\n"
-            content += f"Cause:   {hex(self.cpu.cop0.read(13))}\n"
-            content += f"EPC:     {hex(self.cpu.cop0.read(14))}\n"
-            content += f"Count:   {hex(self.cpu.cop0.read(9))}\n"
-            content += f"Compare: {hex(self.cpu.cop0.read(11))}\n"
-            
-            reg_text.insert(tk.END, content)
+            # A new snapshot object is published after every run_block batch
+            # and whenever CPU state is set from here (boot, reset, state
+            # load); until one appears there is nothing to redraw
+            snapshot = self.cpu.snapshot()
+            if snapshot is shown['snapshot']:
+                if self.emulation_running:
+                    shown['after_id'] = reg_window.after(100, update_registers)
+                return
+            shown['snapshot'] = snapshot
+            
+            cop0 = self.cpu.cop0
+            content = self.REGISTER_VIEW.format(
+                self.cpu.pc, self.cpu.hi, self.cpu.lo, *self.cpu.registers,
+                self.cpu.instructions_executed, self.cpu.cycles,
+                cop0.read(12), cop0.read(13), cop0.read(14), cop0.read(9), cop0.read(11))
+            
+            # Rewrite only the lines that changed since the last refresh
+            lines = content.split("\n")
+            old_lines = shown['lines']
+            if len(lines) != len(old_lines):
+                reg_text.delete(1.0, tk.END)
+                reg_text.insert(tk.END, content)
+            else:
+                for row, (line, old_line) in enumerate(zip(lines, old_lines), 1):
+                    if line != old_line:
+                        reg_text.delete(f"{row}.0", f"{row}.end")
+                        reg_text.insert(f"{row}.0", line)
+            shown['lines'] = lines
             
             if self.emulation_running:
-                reg_window.after(100, update_registers)
+                shown['after_id'] = reg_window.after(100, update_registers)
                 
-        update_registers()
+        def refresh():
+            if shown['after_id'] is None:  # Not already polling
+                update_registers()
+                
+        return refresh
         
     def show_controller_config(self):
         """Show controller configuration"""
-        config_window = tk.Toplevel(self.root)
-        config_window.title("Controller Configuration")
-        config_window.geometry("500x600")
-        config_window.configure(bg="#2b2b2b")
+        self.show_window("controller_config", "Controller Configuration", "500x600",
+                         self.build_controller_config)
         
+    def build_controller_config(self, config_window):
         tk.Label(
             config_window,
             text="N64 Controller Mapping",
@@ -1820,43 +1410,7 @@ Cart ID:        {hex(self.rom_header.cart_id_word)}
         )
         mapping_text.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        mapping_content = """
-════════════════════════════════════════
-        N64 CONTROLLER MAPPING
-════════════════════════════════════════
-
-D-Pad:
-  Up      → Arrow Up
-  Down    → Arrow Down
-  Left    → Arrow Left
-  Right   → Arrow Right
-
-Buttons:
-  A       → Z key
-  B       → X key
-  START   → Enter
-  Z       → A key
-
-Triggers:
-  L       → Q key
-  R       → W key
-
-C-Buttons:
-  C-Up    → I key
-  C-Down  → K key
-  C-Left  → J key
-  C-Right → L key
-
-Analog Stick:
-  Up      → W key
-  Down    → S key
-  Left    → A key
-  Right   → D key
-
-════════════════════════════════════════
-        """
-        
-        mapping_text.insert(tk.END, mapping_content)
+        mapping_text.insert(tk.END, MAPPING_TEXT)
         mapping_text.config(state=tk.DISABLED)
         
     def show_controls(self):
@@ -1895,6 +1449,8 @@ Analog Stick:
             self.rom_list.remove(filepath)
         self.rom_list.insert(0, filepath)
         self.rom_list = self.rom_list[:10]
+        self.rom_hashes = {path: self.rom_hashes[path]
+                           for path in self.rom_list if path in self.rom_hashes}
         self.save_config()
         
     def load_config(self):
@@ -1903,47 +1459,37 @@ Analog Stick:
                 with open(self.config_file, 'r') as f:
                     config = json.load(f)
                     self.rom_list = config.get('recent_roms', [])
+                    self.rom_hashes = config.get('rom_hashes', {})
                     self.plugins_enabled = config.get('plugins', self.plugins_enabled)
             except:
                 pass
                 
     def save_config(self):
+        """Schedule a config write; a burst of changes is written once"""
+        if self.config_save_id is None:
+            self.config_save_id = self.root.after(self.CONFIG_SAVE_DELAY, self.write_config)
+            
+    def write_config(self):
+        self.config_save_id = None
         config = {
             'recent_roms': self.rom_list,
+            'rom_hashes': self.rom_hashes,
             'plugins': self.plugins_enabled
         }
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Write beside the config and swap it in, so a crash mid-write
+        # never leaves a truncated file behind
+        tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(config, f)
+        os.replace(tmp_file, self.config_file)
             
     def show_about(self):
-        about_text = """
-MIPSEMU 1.01-HDR
-Darkness Revived - Enhanced Codex Edition
-
-Nintendo 64 Emulator
-Extended MIPS R4300i Implementation
-
-Features:
-• 60+ MIPS instructions
-• Coprocessor 0 support
-• Enhanced memory system
-• Controller input
-• Save RAM support
-• Graphics rendering
-• Plugin architecture
-
-Python 3.13 | Tkinter GUI
-
-For educational purposes only
-        """
-        messagebox.showinfo("About MIPSEMU", about_text)
+        messagebox.showinfo("About MIPSEMU", ABOUT_TEXT)
         
     def show_readme(self):
-        readme_window = tk.Toplevel(self.root)
-        readme_window.title("README")
-        readme_window.geometry("700x600")
-        readme_window.configure(bg="#2b2b2b")
+        self.show_window("readme", "README", "700x600", self.build_readme)
         
+    def build_readme(self, readme_window):
         readme_text = scrolledtext.ScrolledText(
             readme_window,
             bg="#0a0a0a",
@@ -1952,101 +1498,7 @@ For educational purposes only
         )
         readme_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        readme_content = """
-════════════════════════════════════════════════════════
-         MIPSEMU 1.01-HDR - Darkness Revived
-          Enhanced Codex Edition - README
-════════════════════════════════════════════════════════
-
-VERSION 1.01-HDR ENHANCEMENTS:
-───────────────────────────────
-
-CPU CORE:
-  • Extended instruction set (60+ opcodes)
-  • R-type, I-type, J-type instructions
-  • 64-bit instruction support (stubs)
-  • Multiply/divide operations
-  • Atomic operations (LL/SC)
-  • Branch delay slots
-  • Exception handling
-
-COPROCESSOR 0:
-  • System control registers
-  • Exception handling
-  • Timer/counter support
-  • Status and cause registers
-  • TLB operations (stubs)
-
-MEMORY SYSTEM:
-  • 8MB RDRAM
-  • ROM loading with endian detection
-  • Memory-mapped I/O
-  • SRAM support (32KB)
-  • EEPROM support (2KB)
-  • FlashRAM support (128KB)
-
-CONTROLLER:
-  • Full button mapping
-  • Analog stick support
-  • Keyboard input
-
-GRAPHICS:
-  • Enhanced rendering
-  • Real-time visualization
-  • Performance monitoring
-
-FEATURES:
-  • Save states with full CPU dump
-  • ROM catalogue
-  • Plugin system
-  • Real-time register view
-  • Performance metrics
-
-KEYBOARD CONTROLS:
-──────────────────
-
-Emulator:
-  F5  - Start emulation
-  F6  - Pause emulation
-  F7  - Stop emulation
-  F8  - Reset
-  F9  - Save state
-  F10 - Load state
-
-Controller:
-  Arrow Keys - D-Pad
-  Z/X        - A/B buttons
-  Enter      - START
-  Q/W        - L/R triggers
-  I/K/J/L    - C buttons
-  W/A/S/D    - Analog stick
-
-SUPPORTED ROMS:
-───────────────
-  • .z64 (Big endian)
-  • .n64 (Little endian)
-  • .v64 (Byte-swapped)
-
-LIMITATIONS:
-────────────
-This is an educational implementation. Full N64 
-emulation requires:
-  • Complete RCP (RDP/RSP) implementation
-  • Microcode interpreters
-  • Audio processing
-  • Advanced graphics plugins
-  • Recompiler for performance
-
-DISCLAIMER:
-───────────
-Use ROMs you legally own. This software is for
-educational purposes. Some features may cause
-unexpected behavior.
-
-For support: github.com/mipsemu-hdr
-        """
-        
-        readme_text.insert(tk.END, readme_content)
+        readme_text.insert(tk.END, README_TEXT)
         readme_text.config(state=tk.DISABLED)
 
 
@@ -2055,6 +1507,9 @@ def main():
     app = MIPSEMU(root)
     app.log_frame.pack(side=tk.BOTTOM, fill=tk.X)
     root.mainloop()
+    if app.config_save_id is not None:
+        app.write_config()  # Still waiting when the window closed
+    app.io_pool.shutdown(wait=True)  # Let a save state in progress finish
 
 
 if __name__ == "__main__":
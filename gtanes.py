@@ -25,10 +25,35 @@ PEDESTRIAN_COLOR = (200, 150, 100) # A skin-like tone for pedestrians
 PLAYER_SPEED = 5
 PLAYER_SIZE = 30
 
+def _direction_velocity(mask):
+    """ Player (vx, vy) for a left/right/up/down key mask (bits 0-3) """
+    vx, vy = 0, 0
+    if mask & 1:
+        vx = -PLAYER_SPEED
+    if mask & 2:
+        vx = PLAYER_SPEED
+    if mask & 4:
+        vy = -PLAYER_SPEED
+    if mask & 8:
+        vy = PLAYER_SPEED
+    # Diagonal movement correction
+    if vx != 0 and vy != 0:
+        vx *= 0.7071
+        vy *= 0.7071
+    return vx, vy
+
+# Player velocity for every combination of direction keys
+PLAYER_VELOCITY = tuple(_direction_velocity(mask) for mask in range(16))
+
 # Pedestrian properties
 PEDESTRIAN_SPEED = 2
 PEDESTRIAN_SIZE = 25
 NUM_PEDESTRIANS = 10
+PEDESTRIAN_START_VELOCITIES = (-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED)
+PEDESTRIAN_VELOCITIES = (-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED, 0)
+
+# Walls are bucketed into square cells of this size for collision lookups
+WALL_CELL_SIZE = 64
 
 # --- Game Classes ---
 
@@ -45,21 +70,12 @@ class Player(pygame.sprite.Sprite):
 
     def update(self):
         """ Update player position based on key presses """
-        self.vx, self.vy = 0, 0
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.vx = -PLAYER_SPEED
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.vx = PLAYER_SPEED
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            self.vy = -PLAYER_SPEED
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            self.vy = PLAYER_SPEED
-
-        # Diagonal movement correction
-        if self.vx != 0 and self.vy != 0:
-            self.vx *= 0.7071
-            self.vy *= 0.7071
+        keys = self.game.keys
+        mask = ((keys[pygame.K_LEFT] or keys[pygame.K_a])
+                | (keys[pygame.K_RIGHT] or keys[pygame.K_d]) << 1
+                | (keys[pygame.K_UP] or keys[pygame.K_w]) << 2
+                | (keys[pygame.K_DOWN] or keys[pygame.K_s]) << 3)
+        self.vx, self.vy = PLAYER_VELOCITY[mask]
 
         # Move and check for collisions
         self.rect.x += self.vx
@@ -68,18 +84,11 @@ class Player(pygame.sprite.Sprite):
         self.check_collision('y')
 
         # Keep player on screen
-        if self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.bottom > SCREEN_HEIGHT:
-            self.rect.bottom = SCREEN_HEIGHT
-        if self.rect.top < 0:
-            self.rect.top = 0
+        self.rect.clamp_ip(self.game.screen_rect)
 
     def check_collision(self, direction):
         """ Check for collision with walls """
-        hits = pygame.sprite.spritecollide(self, self.game.walls, False)
+        hits = self.game.wall_hits(self.rect)
         if hits:
             if direction == 'x':
                 if self.vx > 0: # Moving right
@@ -113,12 +122,12 @@ class Pedestrian(pygame.sprite.Sprite):
         while True:
             self.rect.x = random.randrange(0, SCREEN_WIDTH - self.rect.width)
             self.rect.y = random.randrange(0, SCREEN_HEIGHT - self.rect.height)
-            if not pygame.sprite.spritecollide(self, self.game.walls, False):
+            if not self.game.touches_wall(self.rect):
                 break
         
-        self.vx = random.choice([-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED])
-        self.vy = random.choice([-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED])
-        self.change_dir_timer = pygame.time.get_ticks()
+        self.vx = random.choice(PEDESTRIAN_START_VELOCITIES)
+        self.vy = random.choice(PEDESTRIAN_START_VELOCITIES)
+        self.next_dir_change = pygame.time.get_ticks() + random.randrange(2000, 5000)
 
     def update(self):
         """ Move the pedestrian and handle boundaries """
@@ -126,21 +135,22 @@ class Pedestrian(pygame.sprite.Sprite):
         self.rect.y += self.vy
 
         # Change direction periodically
-        now = pygame.time.get_ticks()
-        if now - self.change_dir_timer > random.randrange(2000, 5000): # every 2-5 seconds
-            self.change_dir_timer = now
-            self.vx = random.choice([-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED, 0])
-            self.vy = random.choice([-PEDESTRIAN_SPEED, PEDESTRIAN_SPEED, 0])
-
-        # Bounce off screen edges
-        if self.rect.right > SCREEN_WIDTH or self.rect.left < 0:
-            self.vx *= -1
-        if self.rect.bottom > SCREEN_HEIGHT or self.rect.top < 0:
-            self.vy *= -1
+        now = self.game.now
+        if now > self.next_dir_change: # every 2-5 seconds
+            self.next_dir_change = now + random.randrange(2000, 5000)
+            self.vx = random.choice(PEDESTRIAN_VELOCITIES)
+            self.vy = random.choice(PEDESTRIAN_VELOCITIES)
+
+        # Bounce off screen edges; one contains() test covers the usual
+        # case of being well inside the screen
+        if not self.game.screen_rect.contains(self.rect):
+            if self.rect.right > SCREEN_WIDTH or self.rect.left < 0:
+                self.vx *= -1
+            if self.rect.bottom > SCREEN_HEIGHT or self.rect.top < 0:
+                self.vy *= -1
             
         # Bounce off walls
-        hits = pygame.sprite.spritecollide(self, self.game.walls, False)
-        if hits:
+        if self.game.touches_wall(self.rect):
             # A simple bounce logic
             self.vx *= -1
             self.vy *= -1
@@ -153,19 +163,23 @@ class Game:
     def __init__(self):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen_rect = self.screen.get_rect()
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
+        self.now = 0 # Frame timestamp in ms, shared by all sprites
 
     def new(self):
         """ Start a new game """
         self.all_sprites = pygame.sprite.Group()
+        self.moving_sprites = pygame.sprite.RenderUpdates() # Drawn over the background
         self.walls = pygame.sprite.Group()
         self.pedestrians = pygame.sprite.Group()
 
         # Create player
         self.player = Player(self)
         self.all_sprites.add(self.player)
+        self.moving_sprites.add(self.player)
 
         # Create walls (buildings)
         wall_data = [
@@ -180,15 +194,61 @@ class Game:
             wall = Wall(*data)
             self.all_sprites.add(wall)
             self.walls.add(wall)
+        self.build_wall_grid()
+        self.build_background()
         
         # Create pedestrians
         for _ in range(NUM_PEDESTRIANS):
             ped = Pedestrian(self)
             self.all_sprites.add(ped)
+            self.moving_sprites.add(ped)
             self.pedestrians.add(ped)
 
+        # Show the whole background once; later frames update only the
+        # areas the moving sprites left and entered
+        self.screen.blit(self.background, (0, 0))
+        pygame.display.flip()
         self.run()
 
+    def build_wall_grid(self):
+        """ Bucket walls by the grid cells they overlap """
+        self.wall_list = list(self.walls)
+        self.wall_grid = {}
+        for index, wall in enumerate(self.wall_list):
+            for cell in self.cells_of(wall.rect):
+                self.wall_grid.setdefault(cell, []).append(index)
+
+    def build_background(self):
+        """ Pavement with the walls painted on; walls never move """
+        self.background = pygame.Surface(self.screen_rect.size).convert()
+        self.background.fill(GRAY)
+        for wall in self.walls:
+            self.background.blit(wall.image, wall.rect)
+
+    @staticmethod
+    def cells_of(rect):
+        """ Grid cells a rect overlaps """
+        for cx in range(rect.left // WALL_CELL_SIZE, (rect.right - 1) // WALL_CELL_SIZE + 1):
+            for cy in range(rect.top // WALL_CELL_SIZE, (rect.bottom - 1) // WALL_CELL_SIZE + 1):
+                yield cx, cy
+
+    def wall_hits(self, rect):
+        """ Walls colliding with rect, in the same order spritecollide gives """
+        near = set()
+        for cell in self.cells_of(rect):
+            near.update(self.wall_grid.get(cell, ()))
+        return [self.wall_list[i] for i in sorted(near)
+                if rect.colliderect(self.wall_list[i].rect)]
+
+    def touches_wall(self, rect):
+        """ Whether rect collides with any wall; stops at the first hit """
+        wall_list = self.wall_list
+        for cell in self.cells_of(rect):
+            for i in self.wall_grid.get(cell, ()):
+                if rect.colliderect(wall_list[i].rect):
+                    return True
+        return False
+
     def run(self):
         """ Game Loop """
         self.playing = True
@@ -207,13 +267,15 @@ class Game:
 
     def update(self):
         """ Game Loop - Update """
+        self.now = pygame.time.get_ticks()
+        self.keys = pygame.key.get_pressed() # Read once, used by the player
         self.all_sprites.update()
 
     def draw(self):
         """ Game Loop - Draw """
-        self.screen.fill(GRAY)
-        self.all_sprites.draw(self.screen)
-        pygame.display.flip()
+        self.moving_sprites.clear(self.screen, self.background)
+        dirty = self.moving_sprites.draw(self.screen)
+        pygame.display.update(dirty)
         
     def quit(self):
         pygame.quit()